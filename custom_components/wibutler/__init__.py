@@ -1,24 +1,144 @@
+import time
+
+_IMPORT_START = time.perf_counter()
+
 import asyncio
+import importlib
 import logging
 from typing import Any, Dict, Optional
-from homeassistant.core import HomeAssistant
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.service import async_register_admin_service
 from homeassistant.helpers.typing import ConfigType
-from .const import DOMAIN, PLATFORMS  # Hier wird DOMAIN aus const.py importiert
+from .const import (  # Hier wird DOMAIN aus const.py importiert
+    DOMAIN,
+    PLATFORMS,
+    CONF_CAPTURE_STREAM,
+    CONF_COMMAND_TIMEOUT,
+    CONF_BULK_READ_TIMEOUT,
+    CONF_MAX_CONCURRENCY,
+    CONF_POLL_INTERVAL,
+    CONF_STALE_TIMEOUT,
+    CONF_STALE_ACTUATORS,
+    CONF_COMMAND_BUFFER,
+    COMMAND_BUFFER_SIZE,
+    COMMAND_BUFFER_TTL,
+    STALE_ACTUATOR_TYPES,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_STALE_TIMEOUT,
+    TIMEOUT_BULK_READ,
+    TIMEOUT_COMMAND,
+    CAPTURE_BACKUPS,
+    CAPTURE_FILENAME,
+    CAPTURE_MAX_BYTES,
+    SERVICE_REPLAY_STREAM,
+    SERVICE_PROFILE,
+)
 from .api import WibutlerHub
+from .capture import StreamRecorder, async_replay
+from .command_buffer import CommandBuffer
+from .local_stream import async_register_commands
+from .profiling import LoopProfiler, write_report
 
 _LOGGER = logging.getLogger(__name__)
 
+IMPORT_DURATION = time.perf_counter() - _IMPORT_START
+
+REPLAY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("path"): cv.string,
+        vol.Optional("speed", default=1.0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("duration", default=60): vol.All(vol.Coerce(float), vol.Range(min=1, max=3600)),
+        vol.Optional("threshold_ms", default=10): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("sample_rate", default=0.1): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+    }
+)
+
+
+def _preload_platforms() -> None:
+    """Importiert die Plattform-Module vorab (läuft im Executor, parallel zur Authentifizierung)."""
+    for platform in PLATFORMS:
+        importlib.import_module(f"{__name__}.{platform}")
+
+
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Setze die Konfigurationsdatei ein (configuration.yaml)."""
     _LOGGER.debug("🔄 async_setup() in __init__.py wurde aufgerufen!")
     hass.data.setdefault(DOMAIN, {})
+
+    async def async_handle_replay(call: ServiceCall):
+        """Spielt einen Stream-Mitschnitt über den Dispatch-Pfad ab."""
+        hub = hass.data[DOMAIN].get("hub")
+        if hub is None:
+            _LOGGER.error("❌ Kein Wibutler Hub eingerichtet, Replay nicht möglich")
+            return
+        path = call.data.get("path", hass.config.path(CAPTURE_FILENAME))
+        # Eigene Mitschnittdatei ist immer erlaubt, andere Pfade nur über allowlist_external_dirs
+        if path != hass.config.path(CAPTURE_FILENAME) and not hass.config.is_allowed_path(path):
+            _LOGGER.error("❌ Zugriff auf %s nicht erlaubt (allowlist_external_dirs)", path)
+            return
+        try:
+            await async_replay(hass, hub, path, call.data["speed"])
+        finally:
+            # Replay schreibt historische Werte in den Live-Zustand; danach mit dem Gateway abgleichen
+            await hub.get_devices()
+
+    async_register_admin_service(hass, DOMAIN, SERVICE_REPLAY_STREAM, async_handle_replay, schema=REPLAY_SCHEMA)
+
+    async def async_run_profile(hub: WibutlerHub, duration: float, profiler: LoopProfiler):
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            if hub.profiler is profiler:
+                hub.profiler = None
+        path = hass.config.path(f"wibutler_profile_{int(time.time())}.json")
+        await hass.async_add_executor_job(write_report, path, profiler.report())
+        _LOGGER.info("📊 Profil der Hub-Aktivität geschrieben: %s", path)
+
+    async def async_handle_profile(call: ServiceCall):
+        """Misst Dispatch und Entitäts-Callbacks für die angegebene Dauer und schreibt einen Bericht."""
+        hub = hass.data[DOMAIN].get("hub")
+        if hub is None:
+            _LOGGER.error("❌ Kein Wibutler Hub eingerichtet, Profiling nicht möglich")
+            return
+        if hub.profiler is not None:
+            _LOGGER.warning("⚠️ Es läuft bereits ein Profiling")
+            return
+        hub.profiler = LoopProfiler(call.data["threshold_ms"], call.data["sample_rate"])
+        _LOGGER.info("📊 Profiling für %ss gestartet", call.data["duration"])
+        hass.async_create_task(async_run_profile(hub, call.data["duration"], hub.profiler))
+
+    async_register_admin_service(hass, DOMAIN, SERVICE_PROFILE, async_handle_profile, schema=PROFILE_SCHEMA)
+
+    # Lokale Abnehmer teilen sich die eine Gateway-Verbindung des Hubs
+    async_register_commands(hass)
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Setze die Konfiguration über die UI ein."""
     _LOGGER.debug("🚀 async_setup_entry() wurde aufgerufen! Registriere Plattformen...")
 
+    # Vom Gateway-Probe empfohlene bzw. in den Optionen überschriebene Werte
+    timeouts = {}
+    if CONF_COMMAND_TIMEOUT in entry.options:
+        timeouts[TIMEOUT_COMMAND] = {"total": entry.options[CONF_COMMAND_TIMEOUT]}
+    if CONF_BULK_READ_TIMEOUT in entry.options:
+        timeouts[TIMEOUT_BULK_READ] = {"total": entry.options[CONF_BULK_READ_TIMEOUT]}
+
+    # Aktoren werden nur auf Wunsch überwacht, mit der Schwelle aus den Optionen
+    stale_thresholds = None
+    if entry.options.get(CONF_STALE_ACTUATORS, False):
+        stale_timeout = entry.options.get(CONF_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT)
+        stale_thresholds = {device_type: stale_timeout for device_type in STALE_ACTUATOR_TYPES}
+
     hub = WibutlerHub(
         hass,
         entry.data["host"],
@@ -27,9 +147,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry.data["password"],
         entry.data.get("verify_ssl", False),
         entry.data.get("use_ssl", False),
+        timeouts=timeouts,
+        max_concurrency=entry.options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+        poll_interval=entry.options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+        stale_thresholds=stale_thresholds,
     )
+    if entry.options.get(CONF_CAPTURE_STREAM, False):
+        hub.recorder = StreamRecorder(hass, hass.config.path(CAPTURE_FILENAME), CAPTURE_MAX_BYTES, CAPTURE_BACKUPS)
+        _LOGGER.info("⏺️ Stream-Mitschnitt aktiv: %s", hub.recorder.path)
+
+    if entry.options.get(CONF_COMMAND_BUFFER, False):
+        hub.command_buffer = CommandBuffer(COMMAND_BUFFER_SIZE, COMMAND_BUFFER_TTL)
+
+    profile = hub.startup_profile
+    # Der Modulimport passiert nur einmal pro Prozess, bei einem Reload gibt es ihn nicht
+    if not hass.data[DOMAIN].get("import_reported"):
+        profile.record("import", IMPORT_DURATION)
+        hass.data[DOMAIN]["import_reported"] = True
 
-    if not await hub.authenticate():
+    # Authentifizierung und Import der Plattformen hängen nicht voneinander ab
+    authenticated, _ = await asyncio.gather(
+        profile.timed("auth", hub.authenticate()),
+        profile.timed("platform_import", hass.async_add_executor_job(_preload_platforms)),
+    )
+    if not authenticated:
         _LOGGER.error("❌ Authentifizierung fehlgeschlagen!")
         return False
 
@@ -37,20 +178,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     _LOGGER.debug("📝 API Response (Authentifizierung): %s", hub.token)
 
-    hub.devices = await hub.get_devices()
+    # Stream schon während der Discovery aufbauen
+    hub.ws_task = hass.loop.create_task(hub.run_stream())
+    hub.devices = await profile.timed("discovery", hub.get_devices())
+    hub.start_stale_tracking()
 
-    hass.async_create_task(
-        hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    await profile.timed(
+        "platforms", hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     )
     _LOGGER.debug("✅ Plattformen erfolgreich registriert!")
-    hass.loop.create_task(hub.connect_websocket())
+    profile.log_report()
 
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     return True
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Lädt den Eintrag nach Änderung der Optionen neu."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Entferne eine Konfiguration."""
     _LOGGER.debug("🔄 async_unload_entry() wurde aufgerufen!")
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
-    return unload_ok
\ No newline at end of file
+        hub = hass.data[DOMAIN].pop("hub", None)
+        if hub is not None:
+            await hub.close()
+    return unload_ok
@@ -2,17 +2,44 @@ import aiohttp
 import asyncio
 import json
 import logging
-from typing import Any, Dict, Optional, List, Callable
+import time
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_TIMEOUTS,
+    READ_CACHE_TTL,
+    STALE_THRESHOLDS,
+    STALE_TICK,
+    STALE_WHEEL_SLOTS,
+    TIMEOUT_BULK_READ,
+    TIMEOUT_COMMAND,
+    TIMEOUT_LOGIN,
+    TIMEOUT_STREAM_HANDSHAKE,
+    TRANSITION_MAX_RATE,
+    TRANSITION_TICK,
+)
+from .capture import StreamRecorder
+from .command_buffer import CommandBuffer
+from .staleness import StaleTracker
+from .multiplexer import StreamMultiplexer
+from .profiling import LoopProfiler
+from .store import DeviceStateStore
+from .transition import TransitionManager
+from .startup import StartupProfile
 
 _LOGGER = logging.getLogger(__name__)
 
 class WibutlerHub:
     """Verwaltet die Kommunikation mit der Wibutler API, inklusive WebSockets."""
 
-    def __init__(self, hass: HomeAssistant, host: str, port: int, username: str, password: str, verify_ssl: bool = False, use_ssl: bool = False):
+    def __init__(self, hass: HomeAssistant, host: str, port: int, username: str, password: str, verify_ssl: bool = False, use_ssl: bool = False, timeouts: Optional[Dict[str, Dict[str, float]]] = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, poll_interval: float = DEFAULT_POLL_INTERVAL, stale_thresholds: Optional[Dict[str, float]] = None):
         """Initialisiere Wibutler API-Verbindung."""
         self.hass = hass
         self.host = host
@@ -25,6 +52,42 @@ class WibutlerHub:
         self.token: Optional[str] = None
         self.ws_task: Optional[asyncio.Task] = None
         self.listeners: List[Callable[[str, Any], None]] = []
+        # devices: Geräteliste aus der Discovery (Namen, Typen); aktuelle Werte nur in state
+        self.devices: Dict[str, Any] = {}
+        self.state = DeviceStateStore()
+        self.startup_profile = StartupProfile()
+        self.recorder: Optional[StreamRecorder] = None
+
+        # Zeitbudgets je Operationsklasse, einzelne Werte können überschrieben werden
+        self.timeouts: Dict[str, Dict[str, float]] = {op: dict(budget) for op, budget in DEFAULT_TIMEOUTS.items()}
+        for op, budget in (timeouts or {}).items():
+            self.timeouts.setdefault(op, {}).update(budget)
+
+        # Begrenzt gleichzeitige Anfragen an das Gateway
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.poll_interval = poll_interval
+        self._closing = False
+
+        # Erreichbarkeit des Gateways; Befehle werden bei Bedarf gepuffert und nachgesendet
+        self.connected = True
+        self.command_buffer: Optional[CommandBuffer] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # Helligkeitsrampen aller Lichter über einen Ticker mit gemeinsamem Anfragebudget
+        self.transitions = TransitionManager(self, TRANSITION_MAX_RATE, TRANSITION_TICK)
+        self.profiler: Optional[LoopProfiler] = None
+        self.multiplexer = StreamMultiplexer(hass)
+
+        # Gezielte Lesezugriffe: gleichzeitige Anfragen bündeln, Ergebnisse kurz zwischenspeichern
+        self._read_cache: Dict[Tuple[str, ...], Tuple[float, Any]] = {}
+        self._read_inflight: Dict[Tuple[str, ...], asyncio.Task] = {}
+        # Je Gerät erhöht bei Befehl oder Stream-Änderung; ältere Antworten werden weder übernommen noch gecacht
+        self._read_generation: Dict[str, int] = {}
+
+        # Last-Seen je Gerät, ein gemeinsamer Ticker für alle Geräte
+        self.stale_thresholds: Dict[str, float] = {**STALE_THRESHOLDS, **(stale_thresholds or {})}
+        self.stale_tracker = StaleTracker(STALE_TICK, STALE_WHEEL_SLOTS, self._on_stale_change)
+        self._unsub_stale: Optional[Callable[[], None]] = None
 
         if self.use_ssl:
             self.schema = "https"
@@ -44,13 +107,46 @@ class WibutlerHub:
             _LOGGER.debug("🔒 SSL-Überprüfung ist aktiviert (verify_ssl=True).")
             connector = aiohttp.TCPConnector(ssl=True)  # Aktiviere SSL-Überprüfung
 
-    async def authenticate(self) -> bool:
+    def _deadline(self, op: str, deadline: Optional[float] = None) -> float:
+        """Gibt die Deadline (loop.time()) zurück, ein vorhandenes Budget des Aufrufers hat Vorrang."""
+        own = self.hass.loop.time() + self.timeouts[op]["total"]
+        return own if deadline is None else min(own, deadline)
+
+    def _client_timeout(self, op: str, deadline: float) -> Optional[aiohttp.ClientTimeout]:
+        """Baut das aiohttp-Timeout aus dem Restbudget bis zur Deadline."""
+        remaining = deadline - self.hass.loop.time()
+        if remaining <= 0:
+            return None
+        budget = self.timeouts[op]
+        return aiohttp.ClientTimeout(
+            total=remaining,
+            connect=min(budget["connect"], remaining),
+            sock_read=min(budget["read"], remaining),
+        )
+
+    async def _acquire_slot(self, deadline: float) -> bool:
+        """Belegt einen Slot des Semaphors, höchstens bis zur Deadline."""
+        remaining = deadline - self.hass.loop.time()
+        if remaining <= 0:
+            return False
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), remaining)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def authenticate(self, deadline: Optional[float] = None) -> bool:
         """Authentifiziert sich bei der Wibutler API und speichert das Token."""
         url = f"{self.schema}://{self.baseUrl}:{self.port}/api/login"
         payload = {"username": self.username, "password": self.password}
         _LOGGER.info("✅ Start authenticate")
+        timeout = self._client_timeout(TIMEOUT_LOGIN, self._deadline(TIMEOUT_LOGIN, deadline))
+        if timeout is None:
+            _LOGGER.error("⏱️ Kein Zeitbudget mehr für die Authentifizierung")
+            return False
         try:
-            async with self.session.post(url, json=payload) as response:
+            async with self.session.post(url, json=payload, timeout=timeout) as response:
+                self._set_connected(True)
                 if response.status == 200:
                     data = await response.json()
                     self.token = data.get("sessionToken")
@@ -61,16 +157,35 @@ class WibutlerHub:
                     return True
                 else:
                     _LOGGER.error("❌ Authentifizierung fehlgeschlagen: %s", await response.text())
+        except asyncio.TimeoutError:
+            _LOGGER.error("⏱️ Zeitüberschreitung bei der Authentifizierung")
+            self._set_connected(False)
         except aiohttp.ClientError as err:
             _LOGGER.error("❌ Verbindungsfehler mit Wibutler API: %s", err)
+            if isinstance(err, aiohttp.ClientConnectionError):
+                self._set_connected(False)
         return False
 
-    async def _request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
-        """Sendet eine Anfrage an die Wibutler API."""
+    async def _request(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None, op: str = TIMEOUT_COMMAND, deadline: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Sendet eine Anfrage an die Wibutler API und gibt die Antwort oder None zurück."""
+        return (await self._request_status(method, endpoint, data, op, deadline))[1]
+
+    async def _request_status(self, method: str, endpoint: str, data: Optional[Dict[str, Any]] = None, op: str = TIMEOUT_COMMAND, deadline: Optional[float] = None) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+        """Wie _request, liefert zusätzlich den HTTP-Status.
+
+        Der Status ist None, wenn das Gateway nicht geantwortet hat (Zeitbudget,
+        Verbindungsfehler, Anmeldung); so lässt sich eine Ablehnung durch das
+        Gateway von einer nicht zugestellten Anfrage unterscheiden.
+
+        Die Deadline gilt für den gesamten Aufruf, d.h. eine erneute Authentifizierung
+        samt Wiederholung nach einem 401 muss im ursprünglichen Budget bleiben.
+        """
+        deadline = self._deadline(op, deadline)
+
         if not self.token:
             _LOGGER.warning("Kein Token vorhanden, erneute Authentifizierung erforderlich.")
-            if not await self.authenticate():
-                return None
+            if not await self.authenticate(deadline):
+                return None, None
 
         url = f"{self.schema}://{self.baseUrl}:{self.port}/api/{endpoint}"
         headers = {"Authorization": f"Bearer {self.token}"}
@@ -78,28 +193,191 @@ class WibutlerHub:
         _LOGGER.info("✅ url:  %s", url)
         _LOGGER.info("✅ headers:  %s", headers)
         try:
-            async with self.session.request(method, url, headers=headers, json=data) as response:
-                if response.status in (200, 201):
-                    return await response.json()
-                elif response.status == 401:
-                    _LOGGER.warning("Token abgelaufen, erneute Authentifizierung erforderlich.")
-                    self.token = None
-                    return await self._request(method, endpoint, data)
-                else:
-                    _LOGGER.error("Fehlerhafte API-Antwort (%s): %s", response.status, await response.text())
+            # Auch das Warten auf einen freien Slot zählt zum Budget
+            if not await self._acquire_slot(deadline):
+                _LOGGER.error("⏱️ Kein freier Anfrage-Slot im Zeitbudget für %s %s", method, endpoint)
+                return None, None
+            try:
+                timeout = self._client_timeout(op, deadline)
+                if timeout is None:
+                    _LOGGER.error("⏱️ Zeitbudget für %s %s aufgebraucht", method, endpoint)
+                    return None, None
+                async with self.session.request(method, url, headers=headers, json=data, timeout=timeout) as response:
+                    self._set_connected(True)
+                    if response.status in (200, 201):
+                        return response.status, await response.json()
+                    elif response.status != 401:
+                        _LOGGER.error("Fehlerhafte API-Antwort (%s): %s", response.status, await response.text())
+                        return response.status, None
+            finally:
+                self._semaphore.release()
+            # Wiederholung außerhalb des Semaphors, sonst blockiert sie sich bei max_concurrency=1 selbst
+            _LOGGER.warning("Token abgelaufen, erneute Authentifizierung erforderlich.")
+            self.token = None
+            return await self._request_status(method, endpoint, data, op, deadline)
+        except asyncio.TimeoutError:
+            _LOGGER.error("⏱️ Zeitüberschreitung bei %s %s", method, endpoint)
+            self._set_connected(False)
+        except asyncio.CancelledError:
+            # z.B. Service-Aufruf von Home Assistant abgebrochen; Verbindung wird von aiohttp freigegeben
+            _LOGGER.debug("🛑 Anfrage %s %s abgebrochen", method, endpoint)
+            raise
         except aiohttp.ClientError as err:
             _LOGGER.error("Fehler bei der API-Anfrage: %s", err)
-        return None
+            if isinstance(err, aiohttp.ClientConnectionError):
+                self._set_connected(False)
+        return None, None
+
+    def _set_connected(self, connected: bool):
+        """Merkt sich die Erreichbarkeit und sendet gepufferte Befehle nach einem Reconnect."""
+        if connected and not self.connected:
+            _LOGGER.info("📶 Gateway wieder erreichbar")
+        self.connected = connected
+        if connected:
+            self._ensure_flush()
+
+    def _ensure_flush(self):
+        if self.command_buffer is not None and len(self.command_buffer) and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = self.hass.async_create_task(self._async_flush_commands())
+
+    async def async_send_command(self, device_id: str, component: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Sendet einen Befehl an eine Komponente; ist das Gateway nicht erreichbar, wird er gepuffert."""
+        if self.command_buffer is not None and len(self.command_buffer):
+            # Solange noch Befehle ausstehen, neue hinten einreihen, damit die Reihenfolge stimmt
+            self.command_buffer.add(device_id, component, data, self.hass.loop.time())
+            self._invalidate_reads(device_id)
+            self._ensure_flush()
+            return {"queued": True}
+
+        response = await self._request("PATCH", f"devices/{device_id}/components/{component}", data)
+        self._invalidate_reads(device_id)
+        if response is None and self.command_buffer is not None and not self.connected:
+            _LOGGER.warning("📥 Gateway nicht erreichbar, Befehl %s/%s wird gepuffert", device_id, component)
+            self.command_buffer.add(device_id, component, data, self.hass.loop.time())
+            return {"queued": True}
+        return response
+
+    async def _async_flush_commands(self):
+        """Sendet gepufferte Befehle in Reihenfolge, bis der Puffer leer oder das Gateway wieder weg ist."""
+        buffer = self.command_buffer
+        while (command := buffer.peek(self.hass.loop.time())) is not None:
+            endpoint = f"devices/{command.device_id}/components/{command.component}"
+            status, response = await self._request_status("PATCH", endpoint, command.data)
+            self._invalidate_reads(command.device_id)
+            if status is None:
+                # Nicht zugestellt (Gateway weg oder kein freier Slot): Befehl bleibt gepuffert
+                _LOGGER.warning("📥 Nachsenden unterbrochen, %d Befehle bleiben gepuffert", len(buffer))
+                return
+            if response is None:
+                _LOGGER.error("❌ Gepufferter Befehl %s abgelehnt, wird verworfen", endpoint)
+            buffer.complete(command, accepted=response is not None)
+        _LOGGER.info("📤 Befehlspuffer nachgesendet: %s", buffer.metrics())
 
     async def get_devices(self) -> Optional[Dict[str, Any]]:
         """Holt die Liste der Geräte von der Wibutler API und gibt ein Dictionary zurück."""
         _LOGGER.info("✅ Start get_devices")
-        response = await self._request("GET", "devices")
+        generations = dict(self._read_generation)
+        response = await self._request("GET", "devices", op=TIMEOUT_BULK_READ)
         if isinstance(response, dict):
-            return response.get("devices", {})
+            devices = response.get("devices", {})
+            now = self.hass.loop.time()
+            for device_id, device in devices.items():
+                self.stale_tracker.set_threshold(device_id, self.stale_thresholds.get(device.get("type")))
+                components = device.get("components", [])
+                if self._read_generation.get(device_id, 0) != generations.get(device_id, 0):
+                    # Während der Anfrage neuer Stand per Befehl oder Stream: nur bisher unbekannte Komponenten übernehmen
+                    known = {component["name"] for component in self.state.components(device_id)}
+                    components = [component for component in components if component.get("name") not in known]
+                else:
+                    self._read_cache[("device", device_id)] = (now, device)
+                self._handle_ws_message(device_id, components)
+            return devices
         _LOGGER.error("❌ Erwartete Dictionary-Antwort, aber erhalten: %s", type(response))
         return {}
 
+    async def async_get_device(self, device_id: str, max_age: float = READ_CACHE_TTL) -> Optional[Dict[str, Any]]:
+        """Liest ein einzelnes Gerät samt Komponenten und übernimmt die Werte in den Zustandsspeicher."""
+        return await self._async_coalesced_read(("device", device_id), max_age, self._async_fetch_device(device_id))
+
+    async def async_get_component(self, device_id: str, name: str, max_age: float = READ_CACHE_TTL) -> Optional[Dict[str, Any]]:
+        """Liest eine einzelne Komponente; ein frisches Geräteabbild im Cache genügt ebenfalls."""
+        cached = self._read_cache.get(("device", device_id))
+        if cached is not None and self.hass.loop.time() - cached[0] <= max_age:
+            for component in cached[1].get("components", []):
+                if component.get("name") == name:
+                    return component
+        return await self._async_coalesced_read(
+            ("component", device_id, name), max_age, self._async_fetch_component(device_id, name)
+        )
+
+    async def _async_coalesced_read(self, key: Tuple[str, ...], max_age: float, fetch: Awaitable[Any]) -> Any:
+        """Liefert einen frischen Cache-Eintrag, hängt sich an eine laufende Anfrage an oder startet eine neue."""
+        cached = self._read_cache.get(key)
+        if cached is not None and self.hass.loop.time() - cached[0] <= max_age:
+            fetch.close()
+            return cached[1]
+        task = self._read_inflight.get(key)
+        if task is None:
+            task = self.hass.async_create_task(self._async_cached_fetch(key, fetch))
+            self._read_inflight[key] = task
+        else:
+            fetch.close()
+        # shield: bricht ein Aufrufer ab, läuft die Anfrage für die übrigen weiter
+        return await asyncio.shield(task)
+
+    async def _async_cached_fetch(self, key: Tuple[str, ...], fetch: Awaitable[Any]) -> Any:
+        generation = self._read_generation.get(key[1], 0)
+        try:
+            result = await fetch
+            if result is not None and self._read_generation.get(key[1], 0) == generation:
+                self._read_cache[key] = (self.hass.loop.time(), result)
+            return result
+        finally:
+            if self._read_inflight.get(key) is asyncio.current_task():
+                del self._read_inflight[key]
+
+    async def _async_fetch_device(self, device_id: str) -> Optional[Dict[str, Any]]:
+        generation = self._read_generation.get(device_id, 0)
+        response = await self._request("GET", f"devices/{device_id}", op=TIMEOUT_BULK_READ)
+        if not isinstance(response, dict):
+            return None
+        device = response.get("device", response)
+        if self._read_generation.get(device_id, 0) == generation:
+            self._handle_ws_message(device_id, device.get("components", []))
+        return device
+
+    async def _async_fetch_component(self, device_id: str, name: str) -> Optional[Dict[str, Any]]:
+        generation = self._read_generation.get(device_id, 0)
+        response = await self._request("GET", f"devices/{device_id}/components/{name}", op=TIMEOUT_BULK_READ)
+        if not isinstance(response, dict):
+            return None
+        component = response.get("component", response)
+        if self._read_generation.get(device_id, 0) == generation:
+            self._handle_ws_message(device_id, [component])
+        return component
+
+    def _invalidate_reads(self, device_id: str):
+        """Nach einem Befehl oder einer Stream-Änderung darf ein Lesezugriff nicht aus dem Cache kommen.
+
+        Laufende Anfragen werden abgehängt: neue Leser starten eine eigene, das
+        Ergebnis der alten wird weder übernommen noch gecacht.
+        """
+        self._read_generation[device_id] = self._read_generation.get(device_id, 0) + 1
+        for key in [key for key in self._read_cache if key[1] == device_id]:
+            del self._read_cache[key]
+        for key in [key for key in self._read_inflight if key[1] == device_id]:
+            del self._read_inflight[key]
+
+    async def run_stream(self):
+        """Hält den Stream offen; solange er getrennt ist, wird per REST gepollt."""
+        while not self._closing:
+            await self.connect_websocket()
+            if self._closing:
+                break
+            _LOGGER.warning("🔁 Stream getrennt, Fallback-Polling alle %ss", self.poll_interval)
+            await asyncio.sleep(self.poll_interval)
+            await self.get_devices()  # Änderungen laufen über den Zustandsspeicher an die Entitäten
+
     async def connect_websocket(self):
         """Verbindet sich mit dem WebSocket und empfängt Echtzeit-Updates."""
         if not self.token:
@@ -110,25 +388,97 @@ class WibutlerHub:
         ws_url = f"{ws_protocol}://{self.host}:{self.port}/api/stream/{self.token}"
         _LOGGER.info("🔌 Verbindung zu WebSocket: %s", ws_url)
 
+        handshake_timeout = self.timeouts[TIMEOUT_STREAM_HANDSHAKE]["total"]
+        heartbeat = self.timeouts[TIMEOUT_STREAM_HANDSHAKE]["heartbeat"]
         try:
-            async with self.session.ws_connect(ws_url) as ws:
+            # heartbeat: halboffene TCP-Verbindungen werden erkannt statt ewig auf Frames zu warten
+            ws = await asyncio.wait_for(self.session.ws_connect(ws_url, heartbeat=heartbeat), handshake_timeout)
+            self._set_connected(True)
+            async with ws:
                 async for msg in ws:
                     if msg.type == aiohttp.WSMsgType.TEXT:
-                        try:
-                            data = json.loads(msg.data)
-                            if "data" in data and "components" in data["data"]:
-                                device_id = data["data"]["id"]
-                                self._handle_ws_message(device_id, data["data"]["components"])
-                        except json.JSONDecodeError:
-                            _LOGGER.error("❌ Fehler beim Parsen der WebSocket-Nachricht: %s", msg.data)
+                        if self.recorder is not None:
+                            self.recorder.record(msg.data)
+                        self._process_frame(msg.data)
+        except asyncio.TimeoutError:
+            _LOGGER.error("⏱️ Zeitüberschreitung beim WebSocket-Verbindungsaufbau (%ss)", handshake_timeout)
         except aiohttp.ClientError as err:
             _LOGGER.error("❌ WebSocket-Verbindungsfehler: %s", err)
 
-    def _handle_ws_message(self, device_id: str, components: List[Dict[str, Any]]):
-        """Verarbeitet WebSocket-Nachrichten und benachrichtigt nur relevante Entitäten."""
+    def _process_frame(self, raw: str):
+        """Dekodiert einen Stream-Frame und verteilt ihn (auch für Replays genutzt)."""
+        try:
+            data = json.loads(raw)
+            if "data" in data and "components" in data["data"]:
+                device_id = data["data"]["id"]
+                if self._handle_ws_message(device_id, data["data"]["components"]):
+                    self._invalidate_reads(device_id)
+        except json.JSONDecodeError:
+            _LOGGER.error("❌ Fehler beim Parsen der WebSocket-Nachricht: %s", raw)
+
+    def _handle_ws_message(self, device_id: str, components: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Übernimmt Stream- oder REST-Daten in den Zustandsspeicher und benachrichtigt nur betroffene Entitäten.
+
+        Gibt die tatsächlich geänderten Komponenten zurück.
+        """
+        self.stale_tracker.touch(device_id, self.hass.loop.time())
+        changed = self.state.apply(device_id, components)
+        if not changed:
+            return changed
+        if self.multiplexer.subscribers:
+            self.multiplexer.publish(device_id, changed)
+        if self.profiler is not None:
+            self._handle_ws_message_profiled(device_id, changed)
+            return changed
         for listener in self.listeners:
             if listener._device_id == device_id:  # Nur relevante Entitäten aufrufen
-                listener.handle_ws_update(device_id, components)
+                listener.handle_ws_update(device_id, changed)
+        return changed
+
+    def apply_local(self, device_id: str, name: str, value: Any):
+        """Übernimmt einen Wert nach einem erfolgreich gesendeten Befehl (optimistisch).
+
+        Entitäten schreiben ihren Zustand selbst, lokale Stream-Abnehmer erhalten
+        die Änderung als ``optimistic`` gekennzeichnet, bis das Gateway sie bestätigt.
+        """
+        changed = self.state.apply(device_id, [{"name": name, "value": value}])
+        if changed and self.multiplexer.subscribers:
+            self.multiplexer.publish(device_id, changed, optimistic=True)
+
+    def _handle_ws_message_profiled(self, device_id: str, changed: List[Dict[str, Any]]):
+        """Wie oben, misst aber den Dispatch und jeden Entitäts-Callback."""
+        profiler = self.profiler
+        names = [component.get("name") for component in changed]
+        dispatch_start = time.perf_counter()
+        for listener in self.listeners:
+            if listener._device_id == device_id:
+                start = time.perf_counter()
+                listener.handle_ws_update(device_id, changed)
+                profiler.record("callback", device_id, listener.entity_id or listener.name, names, time.perf_counter() - start)
+        profiler.record("dispatch", device_id, "hub", names, time.perf_counter() - dispatch_start)
+
+    def start_stale_tracking(self):
+        """Startet den gemeinsamen Ticker für die Erkennung verstummter Geräte."""
+        self._unsub_stale = async_track_time_interval(
+            self.hass, self._async_stale_tick, timedelta(seconds=STALE_TICK)
+        )
+
+    @callback
+    def _async_stale_tick(self, now):
+        self.stale_tracker.advance(self.hass.loop.time())
+
+    def is_stale(self, device_id: str) -> bool:
+        """True, wenn das Gerät länger als seine Schwelle nichts gemeldet hat."""
+        return device_id in self.stale_tracker.stale
+
+    def _on_stale_change(self, device_id: str, stale: bool):
+        if stale:
+            _LOGGER.warning("📴 Gerät %s meldet sich nicht mehr, markiere als nicht verfügbar", device_id)
+        else:
+            _LOGGER.info("📶 Gerät %s meldet sich wieder", device_id)
+        for listener in self.listeners:
+            if listener._device_id == device_id:
+                listener.async_write_ha_state()
 
     def register_listener(self, entity):
         """Registriert eine Entität für WebSocket-Updates."""
@@ -136,8 +486,18 @@ class WibutlerHub:
 
     async def close(self):
         """Schließt die HTTP-Sitzung und beendet WebSocket-Verbindung."""
+        self._closing = True
+        if self._unsub_stale is not None:
+            self._unsub_stale()
+            self._unsub_stale = None
         if self.ws_task:
             self.ws_task.cancel()
+        self.transitions.stop()
+        self.multiplexer.close()
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+        if self.recorder is not None:
+            await self.recorder.async_flush()
         await self.session.close()
 
     async def __aenter__(self):
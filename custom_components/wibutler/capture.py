@@ -0,0 +1,124 @@
+"""Mitschnitt und Replay des Wibutler-Streams (/api/stream/{token}).
+
+Format: eine Zeile pro Frame, ``<unix-zeit>\\t<roher JSON-Frame>``. Die Datei wird
+nur angehängt und bei Erreichen von ``max_bytes`` rotiert (``.1`` … ``.N``).
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+
+if TYPE_CHECKING:
+    from .api import WibutlerHub
+
+_LOGGER = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 1.0  # Sekunden
+
+
+class StreamRecorder:
+    """Schreibt rohe Stream-Frames gepuffert im Executor, nie auf dem Event-Loop."""
+
+    def __init__(self, hass: HomeAssistant, path: str, max_bytes: int, backups: int):
+        self.hass = hass
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.frames = 0
+        self._pending: List[str] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._lock = asyncio.Lock()
+
+    def record(self, raw: str):
+        """Merkt einen Frame vor; JSON-Whitespace-Zeilenumbrüche werden entfernt."""
+        self._pending.append(f"{time.time():.3f}\t{raw.replace(chr(10), ' ')}\n")
+        self.frames += 1
+        if self._flush_handle is None:
+            self._flush_handle = self.hass.loop.call_later(
+                FLUSH_INTERVAL, lambda: self.hass.async_create_task(self.async_flush())
+            )
+
+    async def async_flush(self):
+        """Schreibt alle vorgemerkten Frames in die Datei."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        async with self._lock:
+            pending, self._pending = self._pending, []
+            if pending:
+                await self.hass.async_add_executor_job(self._write, "".join(pending))
+
+    def _write(self, chunk: str):
+        data = chunk.encode("utf-8")
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+        with open(self.path, "ab") as file:
+            file.write(data)
+
+    def _rotate(self):
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+def _read_capture(path: str) -> List[Tuple[float, str]]:
+    frames = []
+    skipped = 0
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            timestamp, _, raw = line.rstrip("\n").partition("\t")
+            if not raw:
+                continue
+            try:
+                frames.append((float(timestamp), raw))
+            except ValueError:
+                skipped += 1
+    if skipped:
+        _LOGGER.warning("⚠️ %d fehlerhafte Zeilen in %s übersprungen", skipped, path)
+    return frames
+
+
+async def async_replay(hass: HomeAssistant, hub: "WibutlerHub", path: str, speed: float = 1.0) -> Dict[str, Any]:
+    """Spielt einen Mitschnitt über den Dispatch-Pfad des Hubs ab.
+
+    ``speed`` ist der Zeitraffer-Faktor (1 = Echtzeit, 10 = zehnfach),
+    ``0`` spielt ohne Pausen mit maximaler Geschwindigkeit ab.
+    """
+    frames = await hass.async_add_executor_job(_read_capture, path)
+    _LOGGER.info("▶️ Replay von %d Frames aus %s (Faktor %s)", len(frames), path, speed or "max")
+
+    dispatch_time = 0.0
+    start = time.perf_counter()
+    previous: Optional[float] = None
+    for timestamp, raw in frames:
+        if speed > 0 and previous is not None and timestamp > previous:
+            await asyncio.sleep((timestamp - previous) / speed)
+        elif speed <= 0:
+            await asyncio.sleep(0)  # Event-Loop nicht blockieren
+        previous = timestamp
+
+        dispatch_start = time.perf_counter()
+        hub._process_frame(raw)
+        dispatch_time += time.perf_counter() - dispatch_start
+
+    duration = time.perf_counter() - start
+    stats = {
+        "frames": len(frames),
+        "duration_s": round(duration, 3),
+        "frames_per_s": round(len(frames) / duration, 1) if duration else None,
+        "dispatch_avg_ms": round(dispatch_time / len(frames) * 1000, 3) if frames else None,
+    }
+    _LOGGER.info("⏹️ Replay beendet: %s", stats)
+    return stats
@@ -3,6 +3,9 @@ from homeassistant.components.climate import ClimateEntity
 from homeassistant.components.climate.const import HVACMode, ClimateEntityFeature
 from homeassistant.const import UnitOfTemperature
 from .const import DOMAIN
+from .command_buffer import is_queued
+from .entity import WibutlerEntity
+from .schema import devices_for, get_spec
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -11,14 +14,14 @@ async def async_setup_entry(hass, entry, async_add_entities):
     hub = hass.data[DOMAIN]["hub"]
     devices = hub.devices
 
-    climate_entities = []
-    for device_id, device in devices.items():
-        if device.get("type") in ["RoomOperatingPanels"]:
+    with hub.startup_profile.phase("platform.climate"):
+        climate_entities = []
+        for device in devices_for("climate", devices):
             climate_entities.append(WibutlerClimate(hub, device))
 
-    async_add_entities(climate_entities, True)
+        async_add_entities(climate_entities)
 
-class WibutlerClimate(ClimateEntity):
+class WibutlerClimate(WibutlerEntity, ClimateEntity):
     """Representation of a Wibutler Climate Device."""
 
     def __init__(self, hub, device):
@@ -32,17 +35,16 @@ class WibutlerClimate(ClimateEntity):
         self._attr_supported_features = ClimateEntityFeature.TARGET_TEMPERATURE
         self._attr_temperature_unit = UnitOfTemperature.CELSIUS
 
-        self._current_temperature = None
-        self._target_temperature = None
-        self._fetch_state(device.get("components", []))
+        self._tmp_spec = get_spec(device.get("type"), "TMP")
+        self._tsp_spec = get_spec(device.get("type"), "TSP")
 
     @property
     def current_temperature(self):
-        return self._current_temperature
+        return self._tmp_spec.convert(self._hub.state.get(self._device_id, "TMP"))
 
     @property
     def target_temperature(self):
-        return self._target_temperature
+        return self._tsp_spec.convert(self._hub.state.get(self._device_id, "TSP"))
 
     @property
     def hvac_mode(self):
@@ -60,38 +62,33 @@ class WibutlerClimate(ClimateEntity):
             return
 
         # Berechne den API-Wert
-        new_temp = int((kwargs["temperature"] - 10) * 2)
+        new_temp = self._tsp_spec.encode(kwargs["temperature"])
 
         data = {
             "type": "numeric",
-            "value": str(new_temp)
+            "value": new_temp
         }
 
         _LOGGER.debug(f"📡 PATCH-Request an API: URL=devices/{self._device_id}/components/TSP, Data={data}")
 
-        url = f"devices/{self._device_id}/components/TSP"
-        response = await self._hub._request("PATCH", url, data)
+        response = await self._hub.async_send_command(self._device_id, "TSP", data)
+
+        if is_queued(response):
+            # Erst das Gateway bestätigt den Zustand; bis dahin nichts optimistisch übernehmen
+            _LOGGER.info("📥 Befehl für %s gepuffert, wird nachgesendet", self._attr_name)
+            return
 
         if response:
             _LOGGER.info("🌡️ Temperatur für %s auf %s°C gesetzt (Gesendet: %s)", self._attr_name, kwargs["temperature"], new_temp)
-            self._target_temperature = kwargs["temperature"]
+            self._hub.apply_local(self._device_id, "TSP", new_temp)
             self.async_write_ha_state()
         else:
             _LOGGER.error("❌ Fehler beim Setzen der Temperatur für %s", self._attr_name)
 
-    def _fetch_state(self, components):
-        """Holt den neuen Zustand aus WebSocket-Daten und setzt den Status korrekt."""
-        for component in components:
-            if component.get("name") == "TMP":
-                self._current_temperature = int(component.get("value")) / 100  # TMP / 100
-            elif component.get("name") == "TSP":
-                self._target_temperature = (int(component.get("value")) / 2) + 10  # Umrechnung rückgängig
-
     async def async_added_to_hass(self):
         """Register for WebSocket updates."""
         self._hub.register_listener(self)
 
     def handle_ws_update(self, device_id, components):
         """Process WebSocket update."""
-        self._fetch_state(components)
         self.async_write_ha_state()
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""Puffer für Befehle, die gesendet werden, während das Gateway nicht erreichbar ist."""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+def is_queued(response: Any) -> bool:
+    """Ob ein Befehl nur gepuffert und noch nicht vom Gateway angenommen wurde."""
+    return isinstance(response, dict) and bool(response.get("queued"))
+
+
+@dataclass
+class BufferedCommand:
+    device_id: str
+    component: str
+    data: Dict[str, Any]
+    expires: float
+
+
+class CommandBuffer:
+    """Begrenzter Puffer mit TTL und Last-Write-Wins je (Gerät, Komponente).
+
+    Die Reihenfolge entspricht dem jeweils letzten Schreibzugriff, damit beim
+    Nachsenden die zuletzt gewünschten Zustände auch zuletzt ankommen.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._commands: "OrderedDict[Tuple[str, str], BufferedCommand]" = OrderedDict()
+        self.stats = {
+            "buffered": 0, "superseded": 0, "dropped_overflow": 0, "expired": 0,
+            "replayed": 0, "replayed_superseded": 0, "rejected": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def add(self, device_id: str, component: str, data: Dict[str, Any], now: float):
+        key = (device_id, component)
+        if key in self._commands:
+            self.stats["superseded"] += 1
+            self._commands.move_to_end(key)
+        elif len(self._commands) >= self.max_size:
+            self._commands.popitem(last=False)  # ältesten Befehl verwerfen
+            self.stats["dropped_overflow"] += 1
+        self._commands[key] = BufferedCommand(device_id, component, data, now + self.ttl)
+        self.stats["buffered"] += 1
+
+    def peek(self, now: float) -> Optional[BufferedCommand]:
+        """Ältester noch gültiger Befehl; abgelaufene werden dabei verworfen."""
+        while self._commands:
+            key, command = next(iter(self._commands.items()))
+            if command.expires > now:
+                return command
+            del self._commands[key]
+            self.stats["expired"] += 1
+        return None
+
+    def complete(self, command: BufferedCommand, accepted: bool = True):
+        """Entfernt einen nachgesendeten Befehl, sofern er nicht inzwischen ersetzt wurde.
+
+        ``replayed`` zählt nur angenommene Befehle, die noch aktuell waren; abgelehnte
+        und während des Sendens ersetzte Befehle werden getrennt gezählt.
+        """
+        key = (command.device_id, command.component)
+        if not accepted:
+            self.stats["rejected"] += 1
+        if self._commands.get(key) is command:
+            del self._commands[key]
+            if accepted:
+                self.stats["replayed"] += 1
+        elif accepted:
+            self.stats["replayed_superseded"] += 1
+
+    def metrics(self) -> Dict[str, int]:
+        return {"depth": len(self._commands), **self.stats}
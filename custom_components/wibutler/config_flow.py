@@ -4,7 +4,12 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.core import callback
-from .const import DOMAIN, CONF_HOST, CONF_PORT, CONF_PASSWORD, CONF_USERNAME, CONF_VERIFY_SSL, CONF_USE_SSL
+from .const import (
+    DOMAIN, CONF_HOST, CONF_PORT, CONF_PASSWORD, CONF_USERNAME, CONF_VERIFY_SSL, CONF_USE_SSL, CONF_CAPTURE_STREAM,
+    CONF_COMMAND_TIMEOUT, CONF_BULK_READ_TIMEOUT, CONF_MAX_CONCURRENCY, CONF_POLL_INTERVAL, CONF_STALE_TIMEOUT, CONF_STALE_ACTUATORS, CONF_COMMAND_BUFFER,
+    DEFAULT_MAX_CONCURRENCY, DEFAULT_STALE_TIMEOUT, DEFAULT_POLL_INTERVAL, DEFAULT_TIMEOUTS, TIMEOUT_BULK_READ, TIMEOUT_COMMAND,
+)
+from .probe import ProbeError, async_probe_gateway
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,11 +26,26 @@ DATA_SCHEMA = vol.Schema(
 )
 
 
+def tuning_schema(values):
+    """Formular für Timeouts, Parallelität und Polling-Intervall."""
+    return {
+        vol.Required(CONF_COMMAND_TIMEOUT, default=values.get(CONF_COMMAND_TIMEOUT, DEFAULT_TIMEOUTS[TIMEOUT_COMMAND]["total"])): vol.All(vol.Coerce(float), vol.Range(min=1, max=300)),
+        vol.Required(CONF_BULK_READ_TIMEOUT, default=values.get(CONF_BULK_READ_TIMEOUT, DEFAULT_TIMEOUTS[TIMEOUT_BULK_READ]["total"])): vol.All(vol.Coerce(float), vol.Range(min=1, max=600)),
+        vol.Required(CONF_MAX_CONCURRENCY, default=values.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)): vol.All(int, vol.Range(min=1, max=32)),
+        vol.Required(CONF_POLL_INTERVAL, default=values.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)): vol.All(int, vol.Range(min=10, max=3600)),
+    }
+
+
 class WibutlerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle die Konfigurations-UI für Wibutler."""
 
     VERSION = 1
 
+    def __init__(self):
+        """Zwischenspeicher für Zugangsdaten und Probe-Ergebnis."""
+        self._data = None
+        self._probe = None
+
     async def async_step_user(self, user_input=None):
         """Erster Schritt der Konfiguration."""
         if user_input is None:
@@ -33,7 +53,28 @@ class WibutlerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         _LOGGER.debug(f"🎛️ Wibutler wird mit {user_input} konfiguriert")
 
-        return self.async_create_entry(title="Wibutler", data=user_input)
+        try:
+            self._probe = await async_probe_gateway(self.hass, user_input)
+        except ProbeError:
+            return self.async_show_form(step_id="user", data_schema=DATA_SCHEMA, errors={"base": "cannot_connect"})
+
+        self._data = user_input
+        return await self.async_step_tuning()
+
+    async def async_step_tuning(self, user_input=None):
+        """Zeigt die Messwerte der Probe und die empfohlenen Einstellungen."""
+        if user_input is not None:
+            return self.async_create_entry(title="Wibutler", data=self._data, options=user_input)
+
+        return self.async_show_form(
+            step_id="tuning",
+            data_schema=vol.Schema(tuning_schema(self._probe["recommended"])),
+            description_placeholders={
+                "rtt_ms": str(self._probe["rtt_ms"]),
+                "device_count": str(self._probe["device_count"]),
+                "payload_bytes": str(self._probe["payload_bytes"]),
+            },
+        )
 
     @staticmethod
     @callback
@@ -58,17 +99,22 @@ class WibutlerOptionsFlowHandler(config_entries.OptionsFlow):
             return self.async_create_entry(title="", data=user_input)
 
         # Aktuelle Werte abrufen
-        current_options = self.entry.options if self.entry.options else self.entry.data
+        current_options = {**self.entry.data, **self.entry.options}
 
         # Formular mit aktuellen Werten als Standardwerte
         data_schema = vol.Schema(
             {
+                **tuning_schema(current_options),
+                vol.Required(CONF_STALE_ACTUATORS, default=current_options.get(CONF_STALE_ACTUATORS, False)): bool,
+                vol.Required(CONF_STALE_TIMEOUT, default=current_options.get(CONF_STALE_TIMEOUT, DEFAULT_STALE_TIMEOUT)): vol.All(int, vol.Range(min=60)),
                 vol.Required(CONF_HOST, default=current_options.get(CONF_HOST, "")): str,
                 vol.Required(CONF_PORT, default=current_options.get(CONF_PORT, 8081)): int,
                 vol.Required(CONF_PASSWORD, default=current_options.get(CONF_PASSWORD, "")): str,
                 vol.Required(CONF_USERNAME, default=current_options.get(CONF_USERNAME, "")): str,
                 vol.Required(CONF_VERIFY_SSL, default=current_options.get(CONF_VERIFY_SSL, False)): bool,
                 vol.Required(CONF_USE_SSL, default=current_options.get(CONF_USE_SSL, False)): bool,
+                vol.Required(CONF_CAPTURE_STREAM, default=current_options.get(CONF_CAPTURE_STREAM, False)): bool,
+                vol.Required(CONF_COMMAND_BUFFER, default=current_options.get(CONF_COMMAND_BUFFER, False)): bool,
             }
         )
 
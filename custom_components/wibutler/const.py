@@ -8,5 +8,65 @@ CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_VERIFY_SSL = "verify_ssl"
 CONF_USE_SSL = "use_ssl"
+CONF_CAPTURE_STREAM = "capture_stream"
+CONF_COMMAND_TIMEOUT = "command_timeout"
+CONF_BULK_READ_TIMEOUT = "bulk_read_timeout"
+CONF_MAX_CONCURRENCY = "max_concurrency"
+CONF_POLL_INTERVAL = "poll_interval"
+CONF_STALE_TIMEOUT = "stale_timeout"
+CONF_STALE_ACTUATORS = "stale_actuators"
+CONF_COMMAND_BUFFER = "command_buffer"
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_POLL_INTERVAL = 60  # Sekunden, nur solange der Stream getrennt ist
 
 PLATFORMS = ["sensor", "climate", "cover", "switch", "binary_sensor", "light"]
+
+# Zeitbudgets in Sekunden je Operationsklasse (connect, read, total).
+# Der Stream hat nur ein Gesamtbudget für den Handshake und danach einen Heartbeat:
+# bleibt die Antwort auf einen Ping aus, wird die Verbindung geschlossen und das Fallback-Polling beginnt.
+TIMEOUT_LOGIN = "login"
+TIMEOUT_COMMAND = "command"
+TIMEOUT_BULK_READ = "bulk_read"
+TIMEOUT_STREAM_HANDSHAKE = "stream_handshake"
+
+DEFAULT_TIMEOUTS = {
+    TIMEOUT_LOGIN: {"connect": 5.0, "read": 10.0, "total": 15.0},
+    TIMEOUT_COMMAND: {"connect": 5.0, "read": 10.0, "total": 20.0},
+    TIMEOUT_BULK_READ: {"connect": 5.0, "read": 30.0, "total": 45.0},
+    TIMEOUT_STREAM_HANDSHAKE: {"total": 15.0, "heartbeat": 30.0},
+}
+
+# Stream-Mitschnitt (opt-in)
+CAPTURE_FILENAME = "wibutler_stream.capture"
+CAPTURE_MAX_BYTES = 5 * 1024 * 1024
+CAPTURE_BACKUPS = 3
+
+SERVICE_REPLAY_STREAM = "replay_stream"
+SERVICE_PROFILE = "profile"
+
+# Sekunden ohne Meldung, ab denen ein Gerät als nicht verfügbar gilt.
+# Gerätetypen ohne Eintrag (z.B. Taster, die nur bei Betätigung senden) werden nicht überwacht.
+DEFAULT_STALE_TIMEOUT = 6 * 3600
+STALE_THRESHOLDS = {
+    "RoomOperatingPanels": 1800,
+    "FloorHeatingController": 1800,
+}
+# Aktoren melden sich oft nur bei Zustandsänderungen; Überwachung daher nur auf Wunsch (opt-in)
+STALE_ACTUATOR_TYPES = ("Blind", "SwitchingRelays", "DimminActuators")
+STALE_TICK = 10  # Sekunden pro Slot
+STALE_WHEEL_SLOTS = 64
+
+# Befehlspuffer bei nicht erreichbarem Gateway (opt-in)
+COMMAND_BUFFER_SIZE = 50
+COMMAND_BUFFER_TTL = 300  # Sekunden
+
+# Helligkeitsübergänge: gemeinsamer Ticker und Anfragebudget für alle Lichter
+TRANSITION_TICK = 0.5  # Sekunden
+TRANSITION_MAX_RATE = 4  # PATCH-Anfragen pro Sekunde
+
+# Gezielte Einzel-Lesezugriffe (Gerät/Komponente)
+READ_CACHE_TTL = 2.0  # Sekunden
+
+# Lokale Weiterverteilung des Streams: Puffergröße je Abnehmer (Nachrichten)
+MULTIPLEX_BUFFER = 500
@@ -1,6 +1,9 @@
 import logging
 from homeassistant.components.cover import CoverEntity, CoverDeviceClass, CoverEntityFeature
 from .const import DOMAIN
+from .command_buffer import is_queued
+from .entity import WibutlerEntity
+from .schema import devices_for, get_spec
 import asyncio
 
 _LOGGER = logging.getLogger(__name__)
@@ -10,14 +13,14 @@ async def async_setup_entry(hass, entry, async_add_entities):
     hub = hass.data[DOMAIN]["hub"]
     devices = hub.devices
 
-    covers = []
-    for device_id, device in devices.items():
-        if device.get("type") == "Blind":
+    with hub.startup_profile.phase("platform.cover"):
+        covers = []
+        for device in devices_for("cover", devices):
             covers.append(WibutlerCover(hub, device))
 
-    async_add_entities(covers, True)
+        async_add_entities(covers)
 
-class WibutlerCover(CoverEntity):
+class WibutlerCover(WibutlerEntity, CoverEntity):
     """Representation of a Wibutler Cover Device."""
 
     def __init__(self, hub, device):
@@ -25,27 +28,26 @@ class WibutlerCover(CoverEntity):
         self._hub = hub
         self._device = device
         self._device_id = device['id']
-        self._state = None
         self._attr_name = device['name']
         self._attr_unique_id = device['id']
         self._attr_device_class = CoverDeviceClass.SHUTTER
         self._attr_supported_features = (
             CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.STOP | CoverEntityFeature.SET_POSITION
         )
-        self._position = None
+        self._pos_spec = get_spec(device.get("type"), "POS")
         self._last_command = None  # Speichert den letzten gesendeten Wert (ON oder OFF)
-        self._fetch_state(device.get("components", []))
-
-    def _fetch_state(self, components):
-        """Initialisiert die aktuelle Position aus den Gerätedaten."""
-        for component in components:
-            if component.get("name") == "POS":  # Falls Position gespeichert wird
-                try:
-                    self._position = int(component.get("value"))  # Prozentwert (0-100)
-                except (ValueError, TypeError):
-                    self._position = None
-            if component.get("name") == "STATE":
-                self._state = component.get("value")
+
+    @property
+    def _position(self):
+        """Position aus dem Zustandsspeicher (Prozent geschlossen, 0-100)."""
+        return self._pos_spec.convert(self._hub.state.get(self._device_id, "POS"))
+
+    def _set_position(self, position):
+        self._hub.apply_local(self._device_id, "POS", self._pos_spec.encode(position))
+
+    @property
+    def _state(self):
+        return self._hub.state.get(self._device_id, "STATE")
 
     @property
     def current_cover_position(self):
@@ -81,18 +83,22 @@ class WibutlerCover(CoverEntity):
 
         new_position = 100 - int(kwargs["position"])  # 🔄 Umkehren vor dem Senden
         data = {
-            "value": str(new_position),
+            "value": self._pos_spec.encode(new_position),
             "type": "numeric"
         }
 
         _LOGGER.debug(f"📡 PATCH-Request an API: URL=devices/{self._device_id}/components/POS, Data={data}")
 
-        url = f"devices/{self._device_id}/components/POS"
-        response = await self._hub._request("PATCH", url, data)
+        response = await self._hub.async_send_command(self._device_id, "POS", data)
+
+        if is_queued(response):
+            # Erst das Gateway bestätigt den Zustand; bis dahin nichts optimistisch übernehmen
+            _LOGGER.info("📥 Befehl für %s gepuffert, wird nachgesendet", self._attr_name)
+            return
 
         if response:
             _LOGGER.info("📟 Position für %s auf %s%% gesetzt", self._attr_name, 100 - new_position)
-            self._position = new_position
+            self._set_position(new_position)
             self.async_write_ha_state()
         else:
             _LOGGER.error("❌ Fehler beim Setzen der Position für %s", self._attr_name)
@@ -100,13 +106,17 @@ class WibutlerCover(CoverEntity):
     async def async_open_cover(self, **kwargs):
         """Öffnet das Cover vollständig."""
         data = {"value": "ON", "type": "switch"}
-        url = f"devices/{self._device_id}/components/SWT_POS"
 
-        response = await self._hub._request("PATCH", url, data)
+        response = await self._hub.async_send_command(self._device_id, "SWT_POS", data)
+
+        if is_queued(response):
+            # Erst das Gateway bestätigt den Zustand; bis dahin nichts optimistisch übernehmen
+            _LOGGER.info("📥 Befehl für %s gepuffert, wird nachgesendet", self._attr_name)
+            return
 
         if response:
             _LOGGER.info("⬆️ Cover %s geöffnet", self._attr_name)
-            self._position = 0  # Offen = 0% geschlossen
+            self._set_position(0)  # Offen = 0% geschlossen
             self._last_command = "ON"  # Letzter gesendeter Befehl speichern
             self.async_write_ha_state()
         else:
@@ -115,13 +125,17 @@ class WibutlerCover(CoverEntity):
     async def async_close_cover(self, **kwargs):
         """Schließt das Cover vollständig."""
         data = {"value": "OFF", "type": "switch"}
-        url = f"devices/{self._device_id}/components/SWT_POS"
 
-        response = await self._hub._request("PATCH", url, data)
+        response = await self._hub.async_send_command(self._device_id, "SWT_POS", data)
+
+        if is_queued(response):
+            # Erst das Gateway bestätigt den Zustand; bis dahin nichts optimistisch übernehmen
+            _LOGGER.info("📥 Befehl für %s gepuffert, wird nachgesendet", self._attr_name)
+            return
 
         if response:
             _LOGGER.info("⬇️ Cover %s geschlossen", self._attr_name)
-            self._position = 100  # Geschlossen = 100% geschlossen
+            self._set_position(100)  # Geschlossen = 100% geschlossen
             self._last_command = "OFF"  # Letzter gesendeter Befehl speichern
             self.async_write_ha_state()
         else:
@@ -134,6 +148,7 @@ class WibutlerCover(CoverEntity):
             return
 
         data = {"value": self._last_command, "type": "switch"}
+        # Bewusst ungepuffert: ein später nachgesendeter Stop würde das Cover wieder anfahren
         url = f"devices/{self._device_id}/components/SWT_POS"
 
         # Erster Versuch
@@ -160,5 +175,4 @@ class WibutlerCover(CoverEntity):
 
     def handle_ws_update(self, device_id, components):
         """Process WebSocket update."""
-        self._fetch_state(components)
         self.async_write_ha_state()
\ No newline at end of file
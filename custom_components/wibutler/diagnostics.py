@@ -0,0 +1,28 @@
+"""Diagnosedaten für die Wibutler Integration."""
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PASSWORD, CONF_USERNAME, DOMAIN
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> Dict[str, Any]:
+    """Gibt Diagnosedaten für einen Konfigurationseintrag zurück."""
+    hub = hass.data[DOMAIN].get("hub")
+    data: Dict[str, Any] = {"entry": async_redact_data(dict(entry.data), TO_REDACT)}
+    if hub is not None:
+        data["startup"] = hub.startup_profile.as_dict()
+        now = hass.loop.time()
+        data["last_seen_s_ago"] = {
+            device_id: round(now - seen, 1) for device_id, seen in hub.stale_tracker.last_seen.items()
+        }
+        data["stale_devices"] = sorted(hub.stale_tracker.stale)
+        data["state"] = hub.state.snapshot()
+        data["stream_subscribers"] = hub.multiplexer.metrics()
+        if hub.command_buffer is not None:
+            data["command_buffer"] = hub.command_buffer.metrics()
+    return data
@@ -0,0 +1,17 @@
+"""Gemeinsame Basis für alle Wibutler-Entitäten."""
+
+
+class WibutlerEntity:
+    """Mixin für Eigenschaften, die sich aus dem Hub ergeben (vor der Plattform-Entity einbinden)."""
+
+    # Zustände kommen per Stream, ein Update gibt es nur auf Anforderung (homeassistant.update_entity)
+    _attr_should_poll = False
+
+    @property
+    def available(self) -> bool:
+        """Nicht verfügbar, solange das Gerät über seine Schwelle hinaus stumm ist."""
+        return not self._hub.is_stale(self._device_id)
+
+    async def async_update(self):
+        """Liest nur dieses Gerät neu; gleichzeitige Anfragen werden im Hub gebündelt."""
+        await self._hub.async_get_device(self._device_id)
@@ -2,9 +2,14 @@ import logging
 from homeassistant.components.light import (
     LightEntity,
     ATTR_BRIGHTNESS,
-    SUPPORT_BRIGHTNESS,
+    ATTR_TRANSITION,
+    ColorMode,
+    LightEntityFeature,
 )
 from .const import DOMAIN
+from .command_buffer import is_queued
+from .entity import WibutlerEntity
+from .schema import devices_for, get_spec
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,16 +21,15 @@ async def async_setup_entry(hass, entry, async_add_entities):
     hub = hass.data[DOMAIN]["hub"]
     devices = hub.devices
 
-    lights = []
-    for device_id, device in devices.items():
-        """Typo in the API"""
-        if device.get("type") == "DimminActuators":
+    with hub.startup_profile.phase("platform.light"):
+        lights = []
+        for device in devices_for("light", devices):
             lights.append(WibutlerLight(hub, device))
 
-    async_add_entities(lights, True)
+        async_add_entities(lights)
 
 
-class WibutlerLight(LightEntity):
+class WibutlerLight(WibutlerEntity, LightEntity):
     """Representation of a Wibutler dimmable light."""
 
     def __init__(self, hub, device):
@@ -37,13 +41,13 @@ class WibutlerLight(LightEntity):
         self._is_on = False
         self._brightness_pct = 0
         self._last_brightness_pct = 100
-        self._fetch_state(device.get("components", []))
+        self._bri_spec = get_spec(device.get("type"), "BRI_LVL")
+        self._attr_color_mode = ColorMode.BRIGHTNESS
+        self._attr_supported_color_modes = {ColorMode.BRIGHTNESS}
+        self._attr_supported_features = LightEntityFeature.TRANSITION
+        self._fetch_state(hub.state.components(self._device_id))
 
     # --- Eigenschaften ---
-    @property
-    def supported_features(self):
-        return SUPPORT_BRIGHTNESS
-
     @property
     def is_on(self):
         return self._is_on
@@ -56,6 +60,8 @@ class WibutlerLight(LightEntity):
 
     # --- Schalten ---
     async def async_turn_on(self, **kwargs):
+        # Jeder neue Befehl ersetzt einen laufenden Übergang
+        await self._hub.transitions.async_cancel(self._device_id)
         brightness_pct = self._last_brightness_pct
 
         if ATTR_BRIGHTNESS in kwargs:
@@ -65,7 +71,19 @@ class WibutlerLight(LightEntity):
 
         # wenn kleiner als MIN_PERCENT → direkt ausschalten
         if brightness_pct < MIN_PERCENT:
-            await self.async_turn_off()
+            await self.async_turn_off(**kwargs)
+            return
+
+        if kwargs.get(ATTR_TRANSITION):
+            start_pct = self._brightness_pct if self._is_on and self._brightness_pct >= MIN_PERCENT else MIN_PERCENT
+            self._hub.transitions.start(
+                self._device_id, start_pct, brightness_pct, kwargs[ATTR_TRANSITION], self._bri_spec.encode
+            )
+            _LOGGER.info("💡 Light %s dimmt in %ss auf %d %%", self._attr_name, kwargs[ATTR_TRANSITION], brightness_pct)
+            self._is_on = True
+            self._brightness_pct = brightness_pct
+            self._last_brightness_pct = brightness_pct
+            self.async_write_ha_state()
             return
 
         # SWT → ON
@@ -74,13 +92,18 @@ class WibutlerLight(LightEntity):
         # resp_swt = await self._hub._request("PATCH", url_swt, data_swt)
 
         # BRI_LVL → Prozent mit type "numeric"
-        data_bri = {"type": "numeric", "value": str(brightness_pct)}
-        url_bri = f"devices/{self._device_id}/components/BRI_LVL"
-        resp_bri = await self._hub._request("PATCH", url_bri, data_bri)
+        data_bri = {"type": "numeric", "value": self._bri_spec.encode(brightness_pct)}
+        resp_bri = await self._hub.async_send_command(self._device_id, "BRI_LVL", data_bri)
+        if is_queued(resp_bri):
+            # Erst das Gateway bestätigt den Zustand; bis dahin nichts optimistisch übernehmen
+            _LOGGER.info("📥 Befehl für %s gepuffert, wird nachgesendet", self._attr_name)
+            return
+
         resp_swt = resp_bri
 
         # if resp_swt and resp_bri:
         if resp_bri:
+            self._hub.apply_local(self._device_id, "BRI_LVL", data_bri["value"])
             self._is_on = True
             self._brightness_pct = brightness_pct
             self._last_brightness_pct = brightness_pct
@@ -90,17 +113,34 @@ class WibutlerLight(LightEntity):
             _LOGGER.error("❌ Fehler beim Einschalten/Dimmen von %s", self._attr_name)
 
     async def async_turn_off(self, **kwargs):
+        await self._hub.transitions.async_cancel(self._device_id)
         if self._brightness_pct >= MIN_PERCENT:
             self._last_brightness_pct = self._brightness_pct
 
+        if kwargs.get(ATTR_TRANSITION) and self._is_on and self._brightness_pct >= MIN_PERCENT:
+            # Rampe bis MIN_PERCENT, danach schaltet der Hub SWT aus
+            self._hub.transitions.start(
+                self._device_id, self._brightness_pct, MIN_PERCENT, kwargs[ATTR_TRANSITION], self._bri_spec.encode, turn_off=True
+            )
+            _LOGGER.info("💡 Light %s wird in %ss ausgeblendet", self._attr_name, kwargs[ATTR_TRANSITION])
+            self._is_on = False
+            self._brightness_pct = 0
+            self.async_write_ha_state()
+            return
+
         data = {"value": "OFF", "type": "switch"}
-        url = f"devices/{self._device_id}/components/SWT"
 
-        response = await self._hub._request("PATCH", url, data)
+        response = await self._hub.async_send_command(self._device_id, "SWT", data)
+
+        if is_queued(response):
+            # Erst das Gateway bestätigt den Zustand; bis dahin nichts optimistisch übernehmen
+            _LOGGER.info("📥 Befehl für %s gepuffert, wird nachgesendet", self._attr_name)
+            return
 
         if response:
             _LOGGER.info("💡 Light %s ausgeschaltet (letzte Helligkeit %d %%)",
                          self._attr_name, self._last_brightness_pct)
+            self._hub.apply_local(self._device_id, "SWT", "OFF")
             self._is_on = False
             self._brightness_pct = 0
             self.async_write_ha_state()
@@ -109,24 +149,22 @@ class WibutlerLight(LightEntity):
 
     # --- Initialer & WS-Status ---
     def _fetch_state(self, components):
+        """Leitet An/Aus und Helligkeit aus den Komponenten des Geräts ab (Reihenfolge STATE → BRI_LVL → SWT)."""
         for component in components:
             if component.get("name") == "STATE":
                 value = component.get("value")
                 self._is_on = value != "0"
 
             if component.get("name") == "BRI_LVL":
-                value = component.get("value")
-                try:
-                    pct = int(value)
-                    if pct < MIN_PERCENT:
-                        self._brightness_pct = 0
-                        self._is_on = False
-                    else:
-                        self._brightness_pct = pct
-                        self._last_brightness_pct = pct
-                except (TypeError, ValueError):
+                pct = self._bri_spec.convert(component.get("value"))
+                if pct is None or pct < MIN_PERCENT:
                     self._brightness_pct = 0
                     self._is_on = False
+                else:
+                    self._brightness_pct = pct
+                    # Zwischenwerte einer laufenden Rampe sind keine gewünschte Helligkeit
+                    if not self._hub.transitions.is_active(self._device_id):
+                        self._last_brightness_pct = pct
 
             if component.get("name") == "SWT":
                 value = component.get("value")
@@ -139,5 +177,6 @@ class WibutlerLight(LightEntity):
         self._hub.register_listener(self)
 
     def handle_ws_update(self, device_id, components):
-        self._fetch_state(components)
+        # Nur geänderte Komponenten kommen an; An/Aus und Helligkeit daher aus dem vollständigen Zustand ableiten
+        self._fetch_state(self._hub.state.components(self._device_id))
         self.async_write_ha_state()
@@ -0,0 +1,73 @@
+"""WebSocket-Befehle für lokale Stream-Abnehmer (wibutler/subscribe, wibutler/command)."""
+from typing import Any, Dict
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+
+from .command_buffer import is_queued
+from .const import DOMAIN, MULTIPLEX_BUFFER
+
+
+@callback
+def async_register_commands(hass: HomeAssistant):
+    websocket_api.async_register_command(hass, ws_subscribe)
+    websocket_api.async_register_command(hass, ws_command)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "wibutler/subscribe",
+        vol.Optional("snapshot", default=True): bool,
+        vol.Optional("buffer", default=MULTIPLEX_BUFFER): vol.All(int, vol.Range(min=1, max=10000)),
+    }
+)
+@callback
+def ws_subscribe(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]):
+    """Abonniert alle Zustandsänderungen des Hubs, optional mit aktuellem Snapshot vorab."""
+    hub = hass.data[DOMAIN].get("hub")
+    if hub is None:
+        connection.send_error(msg["id"], "not_ready", "Wibutler Hub ist nicht eingerichtet")
+        return
+
+    @callback
+    def send(payload: Dict[str, Any]):
+        connection.send_message(websocket_api.event_message(msg["id"], payload))
+
+    @callback
+    def closed():
+        # Hub entladen oder neu geladen: Abo beenden, der Abnehmer muss sich neu anmelden
+        connection.subscriptions.pop(msg["id"], None)
+        connection.send_error(msg["id"], "hub_closed", "Wibutler Hub wurde entladen")
+
+    connection.subscriptions[msg["id"]] = hub.multiplexer.subscribe(send, msg["buffer"], closed)
+    connection.send_result(msg["id"])
+    if msg["snapshot"]:
+        send({"snapshot": hub.state.snapshot()})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "wibutler/command",
+        vol.Required("device_id"): str,
+        vol.Required("component"): str,
+        vol.Required("value"): vol.Coerce(str),
+        vol.Optional("value_type", default="numeric"): vol.In(["numeric", "switch"]),
+    }
+)
+@websocket_api.require_admin
+@websocket_api.async_response
+async def ws_command(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]):
+    """Sendet einen Befehl über die bestehende Gateway-Sitzung des Hubs."""
+    hub = hass.data[DOMAIN].get("hub")
+    if hub is None:
+        connection.send_error(msg["id"], "not_ready", "Wibutler Hub ist nicht eingerichtet")
+        return
+
+    data = {"type": msg["value_type"], "value": msg["value"]}
+    response = await hub.async_send_command(msg["device_id"], msg["component"], data)
+    if response is None:
+        connection.send_error(msg["id"], "command_failed", "Gateway hat den Befehl nicht angenommen")
+        return
+    connection.send_result(msg["id"], {"queued": is_queued(response)})
@@ -0,0 +1,100 @@
+"""Lokale Weiterverteilung des dekodierten Streams an mehrere Abnehmer.
+
+Das Gateway sieht weiterhin genau eine Stream-Verbindung; weitere Abnehmer
+(Standby-Instanz, Metrics-Exporter, Diagnosewerkzeuge) hängen sich über die
+WebSocket-API von Home Assistant an den Hub.
+"""
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StreamSubscriber:
+    """Ein Abnehmer mit eigenem, begrenztem Puffer.
+
+    Der Puffer entkoppelt nur den Dispatch des Hubs von der Zustellung und fängt
+    Bursts innerhalb eines Loop-Durchlaufs ab. ``send`` blockiert nicht, langsame
+    Clients regelt die WebSocket-API von Home Assistant selbst (sie trennt
+    Verbindungen mit überlaufender Sendewarteschlange). Ist der Puffer voll, wird
+    die älteste Nachricht verworfen; die Anzahl verworfener Nachrichten wird mit
+    der nächsten Zustellung mitgeschickt, damit der Abnehmer bei Bedarf einen
+    Resync anfordern kann.
+    """
+
+    def __init__(self, hass: HomeAssistant, send: Callable[[Dict[str, Any]], None], buffer: int, on_close: Optional[Callable[[], None]] = None):
+        self._send = send
+        self._on_close = on_close
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=buffer)
+        self.delivered = 0
+        self.dropped = 0
+        self._dropped_since_delivery = 0
+        self._task = hass.async_create_background_task(self._async_deliver(), "wibutler_stream_subscriber")
+
+    def offer(self, message: Dict[str, Any]):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+            self._dropped_since_delivery += 1
+        self._queue.put_nowait(message)
+
+    async def _async_deliver(self):
+        while True:
+            message = await self._queue.get()
+            if self._dropped_since_delivery:
+                message = {**message, "dropped": self._dropped_since_delivery}
+                self._dropped_since_delivery = 0
+            self._send(message)
+            self.delivered += 1
+            await asyncio.sleep(0)  # andere Abnehmer und den Hub nicht aushungern
+
+    def close(self, notify: bool = False):
+        """Beendet die Zustellung; mit ``notify`` erfährt der Abnehmer vom Ende des Streams."""
+        self._task.cancel()
+        if notify and self._on_close is not None:
+            self._on_close()
+
+    def metrics(self) -> Dict[str, int]:
+        return {"queued": self._queue.qsize(), "delivered": self.delivered, "dropped": self.dropped}
+
+
+class StreamMultiplexer:
+    """Verteilt jede Zustandsänderung des Hubs an alle Abnehmer."""
+
+    def __init__(self, hass: HomeAssistant):
+        self.hass = hass
+        self.subscribers: Set[StreamSubscriber] = set()
+
+    def subscribe(self, send: Callable[[Dict[str, Any]], None], buffer: int, on_close: Optional[Callable[[], None]] = None) -> Callable[[], None]:
+        """Registriert einen Abnehmer und gibt die Abmeldefunktion zurück.
+
+        ``on_close`` wird aufgerufen, wenn der Hub den Stream beendet (Entladen, Reload).
+        """
+        subscriber = StreamSubscriber(self.hass, send, buffer, on_close)
+        self.subscribers.add(subscriber)
+        _LOGGER.debug("📡 Neuer Stream-Abnehmer (%d aktiv)", len(self.subscribers))
+
+        def unsubscribe():
+            subscriber.close()
+            self.subscribers.discard(subscriber)
+
+        return unsubscribe
+
+    def publish(self, device_id: str, components: List[Dict[str, Any]], optimistic: bool = False):
+        """Verteilt eine Änderung; ``optimistic`` kennzeichnet Werte, die das Gateway noch nicht gemeldet hat."""
+        message = {"device_id": device_id, "components": components}
+        if optimistic:
+            message["optimistic"] = True
+        for subscriber in self.subscribers:
+            subscriber.offer(message)
+
+    def close(self):
+        subscribers, self.subscribers = self.subscribers, set()
+        for subscriber in subscribers:
+            subscriber.close(notify=True)
+
+    def metrics(self) -> List[Dict[str, int]]:
+        return [subscriber.metrics() for subscriber in self.subscribers]
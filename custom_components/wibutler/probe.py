@@ -0,0 +1,101 @@
+"""Latenz-Probe des Gateways und daraus abgeleitete Einstellungen."""
+import json
+import logging
+import math
+import statistics
+import time
+from typing import Any, Dict
+
+from homeassistant.core import HomeAssistant
+
+from .api import WibutlerHub
+from .const import (
+    CONF_BULK_READ_TIMEOUT,
+    CONF_COMMAND_TIMEOUT,
+    CONF_HOST,
+    CONF_MAX_CONCURRENCY,
+    CONF_PASSWORD,
+    CONF_POLL_INTERVAL,
+    CONF_PORT,
+    CONF_USE_SSL,
+    CONF_USERNAME,
+    CONF_VERIFY_SSL,
+    DEFAULT_TIMEOUTS,
+    TIMEOUT_BULK_READ,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+PROBE_READS = 3
+
+
+class ProbeError(Exception):
+    """Gateway nicht erreichbar oder Anmeldung fehlgeschlagen."""
+
+
+def _clamp(value: float, low: float, high: float) -> float:
+    return max(low, min(high, value))
+
+
+def recommend(rtt: float, fetch_time: float) -> Dict[str, Any]:
+    """Leitet Timeouts, Parallelität und Polling-Intervall aus den Messwerten ab."""
+    if rtt < 0.05:
+        concurrency = 8
+    elif rtt < 0.2:
+        concurrency = 4
+    else:
+        concurrency = 2
+    return {
+        CONF_COMMAND_TIMEOUT: int(_clamp(math.ceil(rtt * 20 + 5), 5, 60)),
+        CONF_BULK_READ_TIMEOUT: int(_clamp(math.ceil(fetch_time * 5 + 10), DEFAULT_TIMEOUTS[TIMEOUT_BULK_READ]["total"], 300)),
+        CONF_MAX_CONCURRENCY: concurrency,
+        # Das komplette Geräteabbild höchstens ~5 % der Zeit abfragen
+        CONF_POLL_INTERVAL: int(_clamp(math.ceil(fetch_time * 20), 30, 600)),
+    }
+
+
+async def async_probe_gateway(hass: HomeAssistant, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Meldet sich an, misst einen Geräteabruf und einige Einzel-Lesezugriffe.
+
+    Gibt die Messwerte samt empfohlener Einstellungen zurück, wirft ProbeError
+    wenn keine Anmeldung möglich ist.
+    """
+    hub = WibutlerHub(
+        hass,
+        data[CONF_HOST],
+        data.get(CONF_PORT, 8081),
+        data[CONF_USERNAME],
+        data[CONF_PASSWORD],
+        data.get(CONF_VERIFY_SSL, False),
+        data.get(CONF_USE_SSL, False),
+    )
+    try:
+        start = time.perf_counter()
+        if not await hub.authenticate():
+            raise ProbeError("login failed")
+        login_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        devices = await hub.get_devices()
+        fetch_time = time.perf_counter() - start
+
+        # Einzel-Lesezugriffe als No-Op, um die reine Umlaufzeit zu messen
+        samples = []
+        for device_id in list(devices)[:1] * PROBE_READS:
+            start = time.perf_counter()
+            await hub.async_get_device(device_id, max_age=0)
+            samples.append(time.perf_counter() - start)
+        rtt = statistics.median(samples) if samples else login_time
+    finally:
+        await hub.close()
+
+    result = {
+        "rtt_ms": round(rtt * 1000, 1),
+        "login_ms": round(login_time * 1000, 1),
+        "fetch_ms": round(fetch_time * 1000, 1),
+        "device_count": len(devices),
+        "payload_bytes": len(json.dumps(devices)),
+        "recommended": recommend(rtt, fetch_time),
+    }
+    _LOGGER.info("📶 Gateway-Probe: %s", result)
+    return result
@@ -0,0 +1,77 @@
+"""Zeitmessung der Dispatch-Pfade auf dem Event-Loop (opt-in per Service)."""
+import json
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Dict, List, Tuple
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_SAMPLES = 10000
+MAX_SLOW_EVENTS = 500
+
+
+class LoopProfiler:
+    """Misst jeden Dispatch und jeden Entitäts-Callback für die Dauer einer Sitzung."""
+
+    def __init__(self, threshold_ms: float, sample_rate: float):
+        self.threshold = threshold_ms / 1000
+        self.sample_rate = sample_rate
+        self.started = time.time()
+        # (Art, Gerät, Ziel) → [Anzahl, Summe, Maximum] in Sekunden
+        self._stats: Dict[Tuple[str, str, str], List[float]] = {}
+        self._slow: deque = deque(maxlen=MAX_SLOW_EVENTS)
+        self._samples: deque = deque(maxlen=MAX_SAMPLES)
+
+    def record(self, kind: str, device_id: str, target: str, components: List[str], duration: float):
+        stats = self._stats.setdefault((kind, device_id, target), [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] = max(stats[2], duration)
+
+        event = {
+            "t": round(time.time() - self.started, 3),
+            "kind": kind,
+            "device": device_id,
+            "target": target,
+            "components": components,
+            "ms": round(duration * 1000, 3),
+        }
+        if duration >= self.threshold:
+            self._slow.append(event)
+            _LOGGER.warning(
+                "🐢 Langsamer %s: %s (Gerät %s, Komponenten %s) brauchte %.1f ms",
+                kind, target, device_id, ", ".join(components), duration * 1000,
+            )
+        if self.sample_rate >= 1 or random.random() < self.sample_rate:
+            self._samples.append(event)
+
+    def report(self) -> Dict[str, Any]:
+        summary = [
+            {
+                "kind": kind,
+                "device": device_id,
+                "target": target,
+                "count": int(count),
+                "mean_ms": round(total / count * 1000, 3),
+                "max_ms": round(peak * 1000, 3),
+                "total_ms": round(total * 1000, 3),
+            }
+            for (kind, device_id, target), (count, total, peak) in self._stats.items()
+        ]
+        summary.sort(key=lambda row: row["total_ms"], reverse=True)
+        return {
+            "duration_s": round(time.time() - self.started, 1),
+            "threshold_ms": self.threshold * 1000,
+            "sample_rate": self.sample_rate,
+            "summary": summary,
+            "slow": list(self._slow),
+            "samples": list(self._samples),
+        }
+
+
+def write_report(path: str, report: Dict[str, Any]):
+    """Schreibt den Bericht (im Executor aufrufen)."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=1)
@@ -0,0 +1,148 @@
+"""Deklaratives Schema der Wibutler-Geräte und -Komponenten mit vorkompilierten Wertkonvertern.
+
+Init- (REST) und Stream-Pfad verwenden dieselben Konverter, damit ein Wert
+unabhängig von seiner Quelle identisch umgerechnet wird. Welche Plattform für
+ein Gerät bzw. eine Komponente Entitäten anlegt, steht ebenfalls hier.
+"""
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import PERCENTAGE, UnitOfTemperature
+
+
+def _raw(value: Any) -> Any:
+    return value
+
+
+def _to_int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _centi(value: Any) -> Optional[float]:
+    """Wibutler liefert Temperaturen in 1/100 °C."""
+    number = _to_int(value)
+    return None if number is None else number / 100
+
+
+def _setpoint(value: Any) -> Optional[float]:
+    """Sollwert: API-Wert = (Temperatur - 10) * 2."""
+    number = _to_int(value)
+    return None if number is None else number / 2 + 10
+
+
+def _encode_setpoint(temperature: float) -> str:
+    return str(int((temperature - 10) * 2))
+
+
+def _encode_int(value: Any) -> str:
+    return str(int(value))
+
+
+@dataclass(frozen=True)
+class ComponentSpec:
+    """Beschreibung einer Komponente: Konverter, Einheit, Geräteklasse und Kodierung für Befehle."""
+
+    convert: Callable[[Any], Any] = _raw
+    unit: Optional[str] = None
+    device_class: Optional[str] = None
+    encode: Optional[Callable[[Any], str]] = None
+
+
+RAW = ComponentSpec()
+TEMPERATURE = ComponentSpec(_centi, UnitOfTemperature.CELSIUS, SensorDeviceClass.TEMPERATURE)
+SETPOINT = replace(TEMPERATURE, convert=_setpoint, encode=_encode_setpoint)
+PERCENT = ComponentSpec(_to_int, PERCENTAGE)
+HUMIDITY = ComponentSpec(_raw, PERCENTAGE, SensorDeviceClass.HUMIDITY)
+LEVEL = ComponentSpec(_to_int, PERCENTAGE, encode=_encode_int)  # Position, Helligkeit
+
+# (Gerätetyp, Komponentenname) → Spezifikation; Gerätetyp None gilt für alle Typen
+COMPONENT_SCHEMA: Dict[Tuple[Optional[str], str], ComponentSpec] = {
+    ("RoomOperatingPanels", "TMP"): TEMPERATURE,
+    ("RoomOperatingPanels", "TSP"): SETPOINT,
+    ("Blind", "POS"): LEVEL,
+    ("DimminActuators", "BRI_LVL"): LEVEL,  # Typo in der API
+}
+
+# Gerätetyp → Plattform, die für das Gerät Entitäten anlegt
+DEVICE_PLATFORMS: Dict[str, str] = {
+    "RoomOperatingPanels": "climate",
+    "FloorHeatingController": "sensor",
+    "Blind": "cover",
+    "SwitchingRelays": "switch",
+    "DimminActuators": "light",  # Typo in der API
+}
+
+# Taster (binary_sensor) unabhängig vom Gerätetyp: Tastenkomponente → Wippe, die den Zustand meldet
+BUTTON_PREFIX = "BTN"
+BUTTON_MAPPING: Dict[str, Tuple[str, ...]] = {
+    "SWT": ("BTN_0", "BTN_1"),  # Single Rocker Switch
+    "SWT_A": ("BTN_A0", "BTN_A1"),  # Left side Rocker
+    "SWT_B": ("BTN_B0", "BTN_B1"),  # Right side Rocker
+}
+
+# Fallback für Komponenten ohne festen Namen: Schlüsselwort im "text" → Spezifikation
+TEXT_RULES: Tuple[Tuple[str, ComponentSpec], ...] = (
+    ("temperature", TEMPERATURE),
+    ("switch-on time", PERCENT),
+    ("humidity", HUMIDITY),
+)
+
+
+def _compile(schema: Dict[Tuple[Optional[str], str], ComponentSpec]):
+    """Baut aus dem Schema direkte Lookup-Tabellen je Gerätetyp."""
+    wildcard = {name: spec for (device_type, name), spec in schema.items() if device_type is None}
+    by_type: Dict[str, Dict[str, ComponentSpec]] = {}
+    for (device_type, name), spec in schema.items():
+        if device_type is not None:
+            by_type.setdefault(device_type, dict(wildcard))[name] = spec
+    return wildcard, by_type
+
+
+_WILDCARD, _BY_TYPE = _compile(COMPONENT_SCHEMA)
+_ROCKERS: Dict[str, str] = {button: rocker for rocker, buttons in BUTTON_MAPPING.items() for button in buttons}
+
+# Ergebnisse der Textheuristik, getrennt von den beim Laden kompilierten Tabellen
+_TEXT_CACHE: Dict[Tuple[Optional[str], str], ComponentSpec] = {}
+
+
+def devices_for(platform: str, devices: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Geräte, für die laut Schema die angegebene Plattform zuständig ist."""
+    return (device for device in devices.values() if DEVICE_PLATFORMS.get(device.get("type")) == platform)
+
+
+def is_button(name: str) -> bool:
+    return name.startswith(BUTTON_PREFIX)
+
+
+def rocker_for(name: str) -> Optional[str]:
+    """Wippen-Komponente, deren Wert den Zustand der Taste enthält (z.B. BTN_A1 → SWT_A)."""
+    return _ROCKERS.get(name)
+
+
+def get_spec(device_type: Optional[str], name: str) -> Optional[ComponentSpec]:
+    """O(1)-Lookup einer Komponente, ohne Textheuristik."""
+    table = _BY_TYPE.get(device_type, _WILDCARD)
+    return table.get(name)
+
+
+def resolve(device_type: Optional[str], component: Dict[str, Any]) -> ComponentSpec:
+    """Ermittelt die Spezifikation einer Komponente.
+
+    Ergebnisse der Textheuristik werden zwischengespeichert, damit sie pro
+    Komponente nur einmal ausgewertet wird.
+    """
+    name = component.get("name")
+    spec = get_spec(device_type, name)
+    if spec is not None:
+        return spec
+
+    key = (device_type, name)
+    spec = _TEXT_CACHE.get(key)
+    if spec is None:
+        text = component.get("text", "").lower()
+        spec = _TEXT_CACHE[key] = next((rule for keyword, rule in TEXT_RULES if keyword in text), RAW)
+    return spec
@@ -0,0 +1,66 @@
+"""Last-Seen-Verwaltung und Erkennung verstummter Geräte über ein Timing Wheel.
+
+Ein einziger Ticker für alle Geräte: ``touch`` ist O(1) und verschiebt nichts im
+Wheel, erst wenn ein Slot fällig wird, werden dessen Einträge geprüft und bei
+neuerer Meldung in den passenden Slot umgehängt. Der Aufwand pro Tick hängt damit
+nur von den fälligen Einträgen ab, nicht von der Gesamtzahl der Geräte.
+"""
+import math
+from typing import Callable, Dict, List, Optional, Set
+
+
+class StaleTracker:
+    """Verfolgt den Zeitpunkt der letzten Meldung je Gerät."""
+
+    def __init__(self, tick: float, slots: int, on_change: Callable[[str, bool], None]):
+        self.tick = tick
+        self.last_seen: Dict[str, float] = {}
+        self.stale: Set[str] = set()
+        self._on_change = on_change
+        self._thresholds: Dict[str, float] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._wheel: List[Set[str]] = [set() for _ in range(slots)]
+        self._scheduled: Set[str] = set()
+        self._cursor = 0
+
+    def set_threshold(self, device_id: str, seconds: Optional[float]):
+        """Setzt die Schwelle für ein Gerät; None deaktiviert die Überwachung."""
+        if seconds is None:
+            self._thresholds.pop(device_id, None)
+        else:
+            self._thresholds[device_id] = seconds
+
+    def touch(self, device_id: str, now: float):
+        """Registriert eine Meldung des Geräts."""
+        self.last_seen[device_id] = now
+        threshold = self._thresholds.get(device_id)
+        if threshold is None:
+            return
+        self._deadlines[device_id] = now + threshold
+        if device_id in self.stale:
+            self.stale.discard(device_id)
+            self._on_change(device_id, False)
+        if device_id not in self._scheduled:
+            self._schedule(device_id, now)
+
+    def _schedule(self, device_id: str, now: float):
+        ticks = max(1, math.ceil((self._deadlines[device_id] - now) / self.tick))
+        # Fernere Deadlines landen im letzten Slot und werden dort erneut einsortiert
+        ticks = min(ticks, len(self._wheel) - 1)
+        self._wheel[(self._cursor + ticks) % len(self._wheel)].add(device_id)
+        self._scheduled.add(device_id)
+
+    def advance(self, now: float):
+        """Ein Tick: prüft nur den fälligen Slot."""
+        self._cursor = (self._cursor + 1) % len(self._wheel)
+        due, self._wheel[self._cursor] = self._wheel[self._cursor], set()
+        for device_id in due:
+            self._scheduled.discard(device_id)
+            deadline = self._deadlines.get(device_id)
+            if deadline is None or device_id not in self._thresholds:
+                continue
+            if deadline <= now:
+                self.stale.add(device_id)
+                self._on_change(device_id, True)
+            else:
+                self._schedule(device_id, now)
@@ -0,0 +1,53 @@
+"""Zeitmessung des Integrationsstarts (Import, Authentifizierung, Discovery, Plattformen)."""
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Dict
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StartupProfile:
+    """Sammelt die Dauer der einzelnen Startphasen in Sekunden."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    def record(self, name: str, seconds: float):
+        self.phases[name] = seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """Misst einen synchronen Abschnitt."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    async def timed(self, name: str, awaitable: Awaitable[Any]) -> Any:
+        """Misst ein Awaitable, auch wenn es parallel zu anderen Phasen läuft."""
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self._started
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": round(self.total * 1000, 1),
+            "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+        }
+
+    def log_report(self):
+        """Schreibt den Startbericht ins Log."""
+        _LOGGER.info(
+            "⏱️ Wibutler Start in %.0f ms: %s",
+            self.total * 1000,
+            ", ".join(f"{name}={seconds * 1000:.0f} ms" for name, seconds in self.phases.items()),
+        )
@@ -0,0 +1,41 @@
+"""Zentraler Zustandsspeicher des Hubs je (Gerät, Komponente)."""
+from typing import Any, Dict, List
+
+
+class DeviceStateStore:
+    """Hält den aktuellen Rohwert jeder Komponente, Stream und REST schreiben Diffs hinein."""
+
+    def __init__(self):
+        self._devices: Dict[str, Dict[str, Any]] = {}
+        self.version = 0
+
+    def get(self, device_id: str, name: str, default: Any = None) -> Any:
+        """O(1)-Lookup des aktuellen Rohwerts."""
+        values = self._devices.get(device_id)
+        if values is None:
+            return default
+        return values.get(name, default)
+
+    def components(self, device_id: str) -> List[Dict[str, Any]]:
+        """Aktuelle Werte eines Geräts im Format der API-Komponenten."""
+        return [{"name": name, "value": value} for name, value in self._devices.get(device_id, {}).items()]
+
+    def apply(self, device_id: str, components: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Übernimmt Komponentenwerte und gibt nur die tatsächlich geänderten zurück."""
+        values = self._devices.setdefault(device_id, {})
+        changed = []
+        for component in components:
+            if "value" not in component:
+                continue
+            name = component.get("name")
+            value = component["value"]
+            if name not in values or values[name] != value:
+                values[name] = value
+                changed.append(component)
+        if changed:
+            self.version += 1
+        return changed
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Konsistente Kopie, gruppiert nach Gerät (Diagnose, Resync)."""
+        return {device_id: dict(values) for device_id, values in self._devices.items()}
@@ -1,6 +1,9 @@
 import logging
 from homeassistant.components.switch import SwitchEntity
 from .const import DOMAIN
+from .command_buffer import is_queued
+from .entity import WibutlerEntity
+from .schema import devices_for
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -9,14 +12,14 @@ async def async_setup_entry(hass, entry, async_add_entities):
     hub = hass.data[DOMAIN]["hub"]
     devices = hub.devices
 
-    switches = []
-    for device_id, device in devices.items():
-        if device.get("type") == "SwitchingRelays":
+    with hub.startup_profile.phase("platform.switch"):
+        switches = []
+        for device in devices_for("switch", devices):
             switches.append(WibutlerSwitch(hub, device))
 
-    async_add_entities(switches, True)
+        async_add_entities(switches)
 
-class WibutlerSwitch(SwitchEntity):
+class WibutlerSwitch(WibutlerEntity, SwitchEntity):
     """Representation of a Wibutler switch."""
 
     def __init__(self, hub, device):
@@ -26,24 +29,30 @@ class WibutlerSwitch(SwitchEntity):
         self._device_id = device["id"]
         self._attr_name = device['name']
         self._attr_unique_id = f"{device['id']}_{device['name']}"
-        self._state = None
-        self._fetch_state(device.get("components", []))
 
     @property
     def is_on(self) -> bool:
         """Return true if the switch is on."""
-        return self._state
+        # STATE bestimmt den tatsächlichen Zustand ("1" = An)
+        value = self._hub.state.get(self._device_id, "STATE")
+        if value is None:
+            return None
+        return value == "1"
 
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
         data = {"value": "ON", "type": "switch"}
-        url = f"devices/{self._device_id}/components/SWT"
 
-        response = await self._hub._request("PATCH", url, data)
+        response = await self._hub.async_send_command(self._device_id, "SWT", data)
+
+        if is_queued(response):
+            # Erst das Gateway bestätigt den Zustand; bis dahin nichts optimistisch übernehmen
+            _LOGGER.info("📥 Befehl für %s gepuffert, wird nachgesendet", self._attr_name)
+            return
 
         if response:
             _LOGGER.info("🔌 Switch %s eingeschaltet", self._attr_name)
-            self._state = True
+            self._hub.apply_local(self._device_id, "STATE", "1")
             self.async_write_ha_state()
         else:
             _LOGGER.error("❌ Fehler beim Einschalten des Switch %s", self._attr_name)
@@ -51,35 +60,25 @@ class WibutlerSwitch(SwitchEntity):
     async def async_turn_off(self, **kwargs):
         """Turn the switch off."""
         data = {"value": "OFF", "type": "switch"}
-        url = f"devices/{self._device_id}/components/SWT"
 
-        response = await self._hub._request("PATCH", url, data)
+        response = await self._hub.async_send_command(self._device_id, "SWT", data)
+
+        if is_queued(response):
+            # Erst das Gateway bestätigt den Zustand; bis dahin nichts optimistisch übernehmen
+            _LOGGER.info("📥 Befehl für %s gepuffert, wird nachgesendet", self._attr_name)
+            return
 
         if response:
             _LOGGER.info("🔌 Switch %s ausgeschaltet", self._attr_name)
-            self._state = False
+            self._hub.apply_local(self._device_id, "STATE", "0")
             self.async_write_ha_state()
         else:
             _LOGGER.error("❌ Fehler beim Ausschalten des Switch %s", self._attr_name)
 
-    def _fetch_state(self, components):
-        """Aktualisiert den Zustand basierend auf den Gerätedaten."""
-        for component in components:
-            if component.get("name") == "STATE":
-                value = component.get("value")
-                _LOGGER.debug(f"🏠 STATE von {self._attr_name}: {value}")
-
-                # STATE bestimmt den tatsächlichen Zustand
-                self._state = value == "1"  # Falls "1" für "An" steht
-
-            if component.get("name") == "SWT":
-                value = component.get("value")
-
     async def async_added_to_hass(self):
         """Register for WebSocket updates."""
         self._hub.register_listener(self)
 
     def handle_ws_update(self, device_id, components):
         """Process WebSocket update."""
-        self._fetch_state(components)
         self.async_write_ha_state()
\ No newline at end of file
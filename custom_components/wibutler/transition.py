@@ -0,0 +1,137 @@
+"""Helligkeitsübergänge, die der Hub für beliebig viele Lichter gemeinsam fährt.
+
+Ein einziger Ticker verteilt ein festes Anfragebudget pro Sekunde auf alle
+laufenden Übergänge. Viele gleichzeitige Fades werden dadurch gröber gestuft,
+erzeugen aber nie mehr Anfragen als das Budget erlaubt.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_interval
+
+if TYPE_CHECKING:
+    from .api import WibutlerHub
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class Transition:
+    device_id: str
+    start_pct: int
+    target_pct: int
+    start: float
+    end: float
+    encode: Callable[[Any], str]  # Kodierung von BRI_LVL laut Komponentenschema
+    turn_off: bool = False  # nach der Rampe SWT=OFF senden
+    last_sent: Optional[int] = None
+    last_sent_at: float = 0.0
+
+    def value_at(self, now: float) -> int:
+        if now >= self.end:
+            return self.target_pct
+        progress = (now - self.start) / (self.end - self.start)
+        return round(self.start_pct + (self.target_pct - self.start_pct) * progress)
+
+
+class TransitionManager:
+    """Fährt Helligkeitsrampen mit begrenzter Anfragerate über einen gemeinsamen Ticker.
+
+    Je Gerät ist höchstens ein Schritt unterwegs; neue Rampen und direkte Befehle
+    warten auf ihn, damit ein alter Schritt einen neueren Befehl nicht überholt.
+    """
+
+    def __init__(self, hub: "WibutlerHub", max_rate: float, tick: float):
+        self.hub = hub
+        self.max_rate = max_rate
+        self.tick = tick
+        self._transitions: Dict[str, Transition] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self._unsub: Optional[Callable[[], None]] = None
+        self._budget = 0.0
+
+    def start(self, device_id: str, start_pct: int, target_pct: int, duration: float, encode: Callable[[Any], str], turn_off: bool = False):
+        """Startet einen Übergang; ein laufender Übergang desselben Geräts wird ersetzt."""
+        now = self.hub.hass.loop.time()
+        self._transitions[device_id] = Transition(device_id, start_pct, target_pct, now, now + duration, encode, turn_off)
+        if self._unsub is None:
+            self._budget = 0.0
+            self._unsub = async_track_time_interval(self.hub.hass, self._async_tick, timedelta(seconds=self.tick))
+
+    async def async_cancel(self, device_id: str):
+        """Bricht den Übergang eines Geräts ab und wartet auf einen noch laufenden Schritt.
+
+        Danach gesendete Befehle kommen garantiert nach dem letzten Rampenschritt an.
+        """
+        if self._transitions.pop(device_id, None) is not None:
+            _LOGGER.debug("⏹️ Übergang für %s abgebrochen", device_id)
+        self._stop_if_idle()
+        task = self._in_flight.get(device_id)
+        if task is not None:
+            # shield: bricht der Aufrufer ab, wird der Schritt trotzdem zu Ende gesendet
+            await asyncio.shield(task)
+
+    def stop(self):
+        """Beendet alle Übergänge und den Ticker (beim Entladen)."""
+        self._transitions.clear()
+        self._stop_if_idle()
+
+    def _stop_if_idle(self):
+        if not self._transitions and self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_tick(self, _now):
+        now = self.hub.hass.loop.time()
+        # Kein Ansparen über einen Tick hinaus, sonst entstehen nach Leerlauf Bursts über der Rate;
+        # bei weniger als einer Anfrage pro Tick wird bis zu einer Anfrage angespart
+        self._budget = min(self._budget + self.max_rate * self.tick, max(self.max_rate * self.tick, 1.0))
+
+        # Abgelaufene Übergänge zuerst, danach die am längsten nicht bedienten
+        pending: List[Transition] = sorted(
+            self._transitions.values(), key=lambda t: (t.end > now, t.last_sent_at)
+        )
+        for transition in pending:
+            if self._budget < 1:
+                break
+            # Höchstens ein Schritt pro Gerät unterwegs, sonst stauen sich Anfragen bei langsamem Gateway
+            if transition.device_id in self._in_flight:
+                continue
+            value = transition.value_at(now)
+            finished = now >= transition.end
+            if value == transition.last_sent and not finished:
+                continue
+            self._budget -= 1
+            transition.last_sent = value
+            transition.last_sent_at = now
+            self._in_flight[transition.device_id] = self.hub.hass.async_create_task(
+                self._async_send(transition, value, finished)
+            )
+        self._stop_if_idle()
+
+    async def _async_send(self, transition: Transition, value: int, finished: bool):
+        try:
+            if finished and transition.turn_off:
+                await self.hub.async_send_command(transition.device_id, "SWT", {"value": "OFF", "type": "switch"})
+            else:
+                data = {"type": "numeric", "value": transition.encode(value)}
+                await self.hub.async_send_command(transition.device_id, "BRI_LVL", data)
+        finally:
+            self._in_flight.pop(transition.device_id, None)
+            # Erst nach dem letzten Schritt entfernen, damit is_active() die ganze Rampe abdeckt
+            if finished and self._transitions.get(transition.device_id) is transition:
+                del self._transitions[transition.device_id]
+                self._stop_if_idle()
+
+    def is_active(self, device_id: str) -> bool:
+        """Ob für das Gerät gerade eine Rampe läuft."""
+        return device_id in self._transitions
+
+    @property
+    def active(self) -> int:
+        return len(self._transitions)
@@ -0,0 +1,98 @@
+"""Tests für den CommandBuffer."""
+import importlib.util
+from pathlib import Path
+
+# command_buffer.py direkt laden, das Paket selbst benötigt Home Assistant
+_SPEC = importlib.util.spec_from_file_location(
+    "wibutler_command_buffer",
+    Path(__file__).resolve().parents[1] / "custom_components" / "wibutler" / "command_buffer.py",
+)
+command_buffer = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(command_buffer)
+
+ON = {"value": "ON", "type": "switch"}
+OFF = {"value": "OFF", "type": "switch"}
+
+
+def make_buffer(max_size=3, ttl=60):
+    return command_buffer.CommandBuffer(max_size, ttl)
+
+
+def drain(buffer, now=0):
+    """Sendet alle Befehle wie der Flush des Hubs und gibt sie in Reihenfolge zurück."""
+    sent = []
+    while (command := buffer.peek(now)) is not None:
+        sent.append((command.device_id, command.component, command.data))
+        buffer.complete(command)
+    return sent
+
+
+def test_last_write_wins_and_moves_to_end():
+    buffer = make_buffer()
+    buffer.add("a", "SWT", ON, 0)
+    buffer.add("b", "SWT", ON, 0)
+    buffer.add("a", "SWT", OFF, 1)
+    assert len(buffer) == 2
+    assert drain(buffer) == [("b", "SWT", ON), ("a", "SWT", OFF)]
+    metrics = buffer.metrics()
+    assert metrics["buffered"] == 3
+    assert metrics["superseded"] == 1
+    assert metrics["replayed"] == 2
+    assert metrics["depth"] == 0
+
+
+def test_overflow_drops_oldest():
+    buffer = make_buffer(max_size=2)
+    buffer.add("a", "SWT", ON, 0)
+    buffer.add("b", "SWT", ON, 0)
+    buffer.add("c", "SWT", ON, 0)
+    assert [device_id for device_id, _, _ in drain(buffer)] == ["b", "c"]
+    assert buffer.stats["dropped_overflow"] == 1
+
+
+def test_expired_commands_are_skipped():
+    buffer = make_buffer(ttl=10)
+    buffer.add("a", "SWT", ON, 0)
+    buffer.add("b", "SWT", ON, 5)
+    assert drain(buffer, now=12) == [("b", "SWT", ON)]
+    assert buffer.stats["expired"] == 1
+    assert buffer.stats["replayed"] == 1
+
+
+def test_rejected_command_is_removed_but_not_replayed():
+    buffer = make_buffer()
+    buffer.add("a", "SWT", ON, 0)
+    command = buffer.peek(0)
+    buffer.complete(command, accepted=False)
+    assert len(buffer) == 0
+    assert buffer.stats["rejected"] == 1
+    assert buffer.stats["replayed"] == 0
+
+
+def test_command_superseded_while_in_flight_stays_buffered():
+    buffer = make_buffer()
+    buffer.add("a", "SWT", ON, 0)
+    in_flight = buffer.peek(0)
+    buffer.add("a", "SWT", OFF, 1)
+    buffer.complete(in_flight)
+    assert buffer.stats["replayed_superseded"] == 1
+    assert buffer.stats["replayed"] == 0
+    assert drain(buffer) == [("a", "SWT", OFF)]
+    assert buffer.stats["replayed"] == 1
+
+
+def test_rejected_superseded_command_counts_once():
+    buffer = make_buffer()
+    buffer.add("a", "SWT", ON, 0)
+    in_flight = buffer.peek(0)
+    buffer.add("a", "SWT", OFF, 1)
+    buffer.complete(in_flight, accepted=False)
+    assert buffer.stats["rejected"] == 1
+    assert buffer.stats["replayed_superseded"] == 0
+    assert len(buffer) == 1
+
+
+def test_is_queued():
+    assert command_buffer.is_queued({"queued": True})
+    assert not command_buffer.is_queued({"value": "ON"})
+    assert not command_buffer.is_queued(None)
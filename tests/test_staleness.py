@@ -0,0 +1,83 @@
+"""Tests für den StaleTracker (Timing Wheel)."""
+import importlib.util
+from pathlib import Path
+
+# staleness.py direkt laden, das Paket selbst benötigt Home Assistant
+_SPEC = importlib.util.spec_from_file_location(
+    "wibutler_staleness",
+    Path(__file__).resolve().parents[1] / "custom_components" / "wibutler" / "staleness.py",
+)
+staleness = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(staleness)
+
+TICK = 10
+
+
+def make_tracker(slots=8):
+    changes = []
+    tracker = staleness.StaleTracker(TICK, slots, lambda device_id, stale: changes.append((device_id, stale)))
+    return tracker, changes
+
+
+def run(tracker, start, end):
+    """Tickt wie der Hub-Ticker von start bis end."""
+    now = start
+    while now < end:
+        now += TICK
+        tracker.advance(now)
+    return now
+
+
+def test_device_without_threshold_is_not_monitored():
+    tracker, changes = make_tracker()
+    tracker.touch("a", 0)
+    run(tracker, 0, 1000)
+    assert tracker.last_seen["a"] == 0
+    assert changes == []
+    assert not tracker.stale
+
+
+def test_device_becomes_stale_after_threshold():
+    tracker, changes = make_tracker()
+    tracker.set_threshold("a", 30)
+    tracker.touch("a", 0)
+    run(tracker, 0, 20)
+    assert changes == []
+    run(tracker, 20, 40)
+    assert changes == [("a", True)]
+    assert tracker.stale == {"a"}
+
+
+def test_touch_postpones_and_recovers():
+    tracker, changes = make_tracker()
+    tracker.set_threshold("a", 30)
+    tracker.touch("a", 0)
+    run(tracker, 0, 20)
+    tracker.touch("a", 20)
+    run(tracker, 20, 40)
+    assert changes == []
+
+    run(tracker, 40, 60)
+    assert changes == [("a", True)]
+    tracker.touch("a", 65)
+    assert changes == [("a", True), ("a", False)]
+    assert not tracker.stale
+
+
+def test_threshold_beyond_wheel_is_rescheduled():
+    tracker, changes = make_tracker(slots=4)
+    tracker.set_threshold("a", 100)
+    tracker.touch("a", 0)
+    run(tracker, 0, 90)
+    assert changes == []
+    run(tracker, 90, 130)
+    assert changes == [("a", True)]
+
+
+def test_removed_threshold_stops_monitoring():
+    tracker, changes = make_tracker()
+    tracker.set_threshold("a", 30)
+    tracker.touch("a", 0)
+    tracker.set_threshold("a", None)
+    run(tracker, 0, 100)
+    assert changes == []